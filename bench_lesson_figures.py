@@ -0,0 +1,143 @@
+"""
+Benchmark every lesson figure recipe across synthetic data sizes.
+
+Each (figure, size) case runs in a fresh Python process so its peak RSS is its
+own, and reports as JSON:
+- data_s / build_s / save_s: data generation, drawing (hist, scatter,
+  colorbar, tight_layout, ...) and rasterizing/writing the file
+- peak_rss_mb and baseline_rss_mb (after imports, before any work)
+- file_bytes: size of the written figure
+
+Sizes grow per figure until a case fails or hits --timeout, which is where
+that recipe stops scaling; larger sizes are then skipped. Figures without
+data (the figsize/subplot demos) run once at the lesson size.
+
+Usage:
+    python bench_lesson_figures.py                              # all figures, 200 .. 10M songs
+    python bench_lesson_figures.py part5_music_dashboard --sizes 200 20000 2000000
+    python bench_lesson_figures.py --density --out bench_density.json
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DEFAULT_SIZES = [200, 2_000, 20_000, 200_000, 1_000_000, 10_000_000]
+
+
+def _rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(name, n, fmt='png', dpi=100, density=False, budget=None):
+    """Time one figure at one size. Runs in the child process."""
+    from headless_render import use_headless
+    plt = use_headless()
+    import lesson_figures
+    baseline = _rss_mb()
+
+    rng = lesson_figures.figure_rng(name)
+    start = time.perf_counter()
+    data = lesson_figures.make_data(name, rng, n)
+    data_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fig = lesson_figures.draw_figure(name, data, density=density, budget=budget)
+    build_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f'{name}.{fmt}'
+        start = time.perf_counter()
+        fig.savefig(path, dpi=dpi)
+        save_s = time.perf_counter() - start
+        file_bytes = path.stat().st_size
+    plt.close(fig)
+
+    return {'figure': name, 'n': n, 'format': fmt, 'density': density, 'budget': budget,
+            'data_s': data_s, 'build_s': build_s, 'save_s': save_s,
+            'total_s': data_s + build_s + save_s,
+            'baseline_rss_mb': baseline, 'peak_rss_mb': _rss_mb(), 'file_bytes': file_bytes,
+            'status': 'ok'}
+
+
+def _spawn_case(name, n, args):
+    command = [sys.executable, __file__, '--case', name, str(n or 0),
+               '--format', args.format, '--dpi', str(args.dpi)]
+    if args.density:
+        command.append('--density')
+    if args.budget is not None:
+        command += ['--budget', str(args.budget)]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout,
+                                cwd=Path(__file__).resolve().parent)
+    except subprocess.TimeoutExpired:
+        return {'figure': name, 'n': n, 'status': 'timeout', 'timeout_s': args.timeout}
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1:] or ['exit code %d' % result.returncode]
+        return {'figure': name, 'n': n, 'status': 'error', 'error': error[0]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmarks(args):
+    import lesson_figures
+    names = args.names or list(lesson_figures.FIGURES)
+    results = []
+    for name in names:
+        scalable = lesson_figures.FIGURES[name][0] is not None
+        for n in (args.sizes if scalable else [None]):
+            record = _spawn_case(name, n, args)
+            results.append(record)
+            if record['status'] == 'ok':
+                print(f"  ⏱️  {name:<28} n={record['n'] or '-':>10}  total {record['total_s']:8.3f}s  "
+                      f"(data {record['data_s']:.3f} / build {record['build_s']:.3f} / "
+                      f"save {record['save_s']:.3f})  peak {record['peak_rss_mb']:7.1f} MB  "
+                      f"{record['file_bytes'] / 1024:8.1f} KB", flush=True)
+            else:
+                print(f"  ❌ {name:<28} n={n or '-':>10}  {record['status']}: stops scaling here; "
+                      f"skipping larger sizes", flush=True)
+                break
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the lesson figure recipes.')
+    parser.add_argument('names', nargs='*', help='figures to benchmark (default: all)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='songs per case')
+    parser.add_argument('--format', default='png')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--density', action='store_true', help='density images instead of markers')
+    parser.add_argument('--budget', type=int, default=None, help='thin scatters to about this many points')
+    parser.add_argument('--timeout', type=float, default=600, help='seconds per case')
+    parser.add_argument('--out', default='bench_results.json', help='JSON report')
+    parser.add_argument('--case', nargs=2, metavar=('FIGURE', 'N'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        name, n = args.case
+        print(json.dumps(run_case(name, int(n) or None, args.format, args.dpi, args.density, args.budget)))
+        return
+
+    import matplotlib
+    import numpy
+    report = {
+        'python': platform.python_version(), 'platform': platform.platform(),
+        'matplotlib': matplotlib.__version__, 'numpy': numpy.__version__,
+        'sizes': args.sizes, 'format': args.format, 'dpi': args.dpi, 'density': args.density,
+        'budget': args.budget,
+        'results': run_benchmarks(args),
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'\n✅ Results written to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Image-regression checks for every lesson figure.
+
+Each figure in lesson_figures.FIGURES is rendered headlessly with its fixed
+seed (figure_rng) and compared with a stored baseline PNG:
+1. byte-identical files pass right away, and that is the common case
+2. otherwise the full-size pixels are compared, and the figure passes only if
+   the RMS difference stays within --max-rms (0-255 scale); the share of
+   differing bits of a downscaled perceptual hash (image_hash.dhash) is
+   reported next to it as a rough "how different does it look"
+
+Equal hashes alone never pass a figure: a 32x32 thumbnail can miss a changed
+title or tick label that the pixel RMS catches.
+
+A failing figure leaves <name>.png and <name>-diff.png in the results
+directory. Figures are rendered and checked in parallel worker processes, and
+the exit status is non-zero if any figure fails, so the check can gate a
+change.
+
+Baselines depend on the local matplotlib and FreeType versions. Generate them
+once with --update, look at them, and commit them. After an intended visual
+change, run --update again for the affected figures.
+
+Usage:
+    python check_figures.py --update                  # (re)write the baselines
+    python check_figures.py                           # check every figure
+    python check_figures.py part5_music_dashboard --max-rms 1
+"""
+
+import argparse
+import filecmp
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+LESSON_DIR = Path(__file__).resolve().parent
+BASELINE_DIR = LESSON_DIR / 'figure_baselines'
+RESULTS_DIR = LESSON_DIR / 'figure_results'
+HASH_SIZE = 32
+MAX_RMS = 2.0
+DPI = 100
+
+
+def _write_diff(result, baseline, path):
+    """Save |result - baseline| with every changed pixel made clearly visible."""
+    from PIL import Image
+    from image_hash import load_rgb
+    difference = np.abs(load_rgb(result) - load_rgb(baseline)).max(axis=2)
+    shade = np.where(difference > 0, 255 - np.minimum(difference * 4, 200), 255)
+    Image.fromarray(shade.astype(np.uint8)).save(path)
+
+
+def check_figure(name, baseline_dir=BASELINE_DIR, results_dir=RESULTS_DIR, update=False, max_rms=MAX_RMS):
+    """Render one figure and compare it with its baseline. Runs inside a worker process."""
+    from image_hash import dhash, hash_distance, pixel_rms
+    from parallel_render import render_figure
+
+    start = time.perf_counter()
+    result = Path(render_figure(name, results_dir, 'png', DPI)['path'])
+    baseline = Path(baseline_dir) / f'{name}.png'
+    record = {'name': name, 'render_s': time.perf_counter() - start, 'rms': None, 'hash_distance': None}
+
+    if update:
+        shutil.copyfile(result, baseline)
+        record['status'] = 'updated'
+    elif not baseline.exists():
+        record['status'] = 'missing'
+    elif filecmp.cmp(result, baseline, shallow=False):
+        record['status'] = 'pass'
+    else:
+        record['hash_distance'] = hash_distance(dhash(result, HASH_SIZE), dhash(baseline, HASH_SIZE))
+        try:
+            record['rms'] = pixel_rms(result, baseline)
+            record['status'] = 'pass' if record['rms'] <= max_rms else 'fail'
+        except ValueError as error:  # sizes differ
+            record['status'], record['error'] = 'fail', str(error)
+        if record['status'] == 'fail' and 'error' not in record:
+            _write_diff(result, baseline, Path(results_dir) / f'{name}-diff.png')
+
+    if record['status'] != 'fail':
+        result.unlink()
+    record['check_s'] = time.perf_counter() - start
+    return record
+
+
+def check_all(names=None, baseline_dir=BASELINE_DIR, results_dir=RESULTS_DIR, update=False,
+              max_rms=MAX_RMS, workers=None):
+    """Check the given figures (default: all of them) in parallel; one record each."""
+    from fast_start import prepare
+    prepare()  # forked workers start with pyplot imported and the fonts warm
+    from lesson_figures import FIGURES
+    names = list(names or FIGURES)
+    unknown = [name for name in names if name not in FIGURES]
+    if unknown:
+        raise ValueError(f'Unknown figure(s): {", ".join(unknown)}')
+    Path(baseline_dir).mkdir(parents=True, exist_ok=True)
+    Path(results_dir).mkdir(parents=True, exist_ok=True)
+
+    workers = min(workers or os.cpu_count() or 1, len(names))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(check_figure, name, baseline_dir, results_dir, update, max_rms)
+                   for name in names]
+        return [future.result() for future in futures]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare lesson figures against stored baselines.')
+    parser.add_argument('names', nargs='*', help='figures to check (default: all)')
+    parser.add_argument('--update', action='store_true', help='write new baselines instead of checking')
+    parser.add_argument('--baselines', default=str(BASELINE_DIR))
+    parser.add_argument('--results', default=str(RESULTS_DIR), help='where failing figures and diffs go')
+    parser.add_argument('--max-rms', type=float, default=MAX_RMS,
+                        help='largest pixel RMS difference (0-255) that still passes')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per core)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    records = check_all(args.names, args.baselines, args.results, args.update, args.max_rms, args.workers)
+    total = time.perf_counter() - start
+
+    icons = {'pass': '✅', 'updated': '📸', 'missing': '❓', 'fail': '❌'}
+    for record in records:
+        detail = record.get('error') or ('' if record['rms'] is None else
+                                         f"pixel RMS {record['rms']:.2f}, hash {record['hash_distance']:.1%} off")
+        print(f"  {icons[record['status']]} {record['name']:<30} {record['status']:<8} "
+              f"{record['check_s']:6.3f}s   {detail}")
+    failed = [record for record in records if record['status'] in ('fail', 'missing')]
+    print(f'\n{"❌" if failed else "✅"} {len(records) - len(failed)}/{len(records)} figures '
+          f'{"updated" if args.update else "match their baselines"} in {total:.2f}s')
+    if any(record['status'] == 'missing' for record in records):
+        print('   missing baselines: run python check_figures.py --update')
+    if any(record['status'] == 'fail' for record in records):
+        print(f'   failing figures and diffs are in {args.results}/')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
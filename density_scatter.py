@@ -0,0 +1,129 @@
+"""
+Density-raster scatter plots for catalogs with millions of songs.
+
+plt.scatter() draws one marker per point, so its cost grows with the number of
+songs, and with that many points alpha blending saturates into a solid blob.
+Instead we count how many points land in each screen pixel (one np.bincount
+over the whole array) and show the counts as an image with a log or
+histogram-equalized color scale. Drawing cost then depends on the pixel count
+of the axes, not on how many songs there are.
+
+    from density_scatter import density_scatter
+    density_scatter(danceability, popularity, cmap='Greens')
+    plt.colorbar(label='Songs per pixel')
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import colors
+
+
+def data_extent(x, y):
+    """(xmin, xmax, ymin, ymax) of the finite points, padded if a range is empty."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    extent = []
+    for values in (x, y):
+        values = values[np.isfinite(values)]
+        low, high = (values.min(), values.max()) if values.size else (0.0, 1.0)
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        extent += [float(low), float(high)]
+    return tuple(extent)
+
+
+def density_grid(x, y, shape, extent=None, values=None):
+    """Count the points falling in each cell of a (rows, cols) grid.
+
+    Returns (grid, extent). Row 0 is the bottom of the plot (use origin='lower').
+    With `values`, each cell holds the sum of those values instead of a count,
+    so grid / counts gives a per-pixel mean.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    rows, cols = shape
+    if extent is None:
+        extent = data_extent(x, y)
+    x0, x1, y0, y1 = extent
+
+    col = np.floor((x - x0) * (cols / (x1 - x0)))
+    row = np.floor((y - y0) * (rows / (y1 - y0)))
+    # Points exactly on the right/top edge belong in the last cell, like np.histogram
+    col[x == x1] = cols - 1
+    row[y == y1] = rows - 1
+    inside = (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+
+    cell = row[inside].astype(np.intp) * cols + col[inside].astype(np.intp)
+    weights = None if values is None else np.asarray(values)[inside]
+    grid = np.bincount(cell, weights=weights, minlength=rows * cols)
+    return grid.reshape(rows, cols), extent
+
+
+def pixel_shape(ax):
+    """(rows, cols) of screen pixels covered by an Axes."""
+    bbox = ax.get_window_extent()
+    return max(1, int(round(bbox.height))), max(1, int(round(bbox.width)))
+
+
+def equalized_norm(counts, n_levels=256):
+    """A histogram-equalized norm: each color covers the same share of the non-empty pixels."""
+    filled = counts[counts > 0]
+    if filled.size == 0:
+        return colors.Normalize(0, 1)
+    boundaries = np.unique(np.quantile(filled, np.linspace(0, 1, n_levels + 1)))
+    if boundaries.size < 2:
+        return colors.Normalize(0, boundaries[0])
+    return colors.BoundaryNorm(boundaries, ncolors=256)
+
+
+def make_norm(norm, counts):
+    """Turn 'log', 'eq' or 'linear' into a Normalize for the given counts."""
+    if isinstance(norm, colors.Normalize):
+        return norm
+    filled = counts[counts > 0]
+    high = filled.max() if filled.size else 1
+    if norm == 'log':
+        return colors.LogNorm(vmin=max(filled.min(), 1e-12) if filled.size else 1, vmax=max(high, 1))
+    if norm == 'eq':
+        return equalized_norm(counts)
+    if norm == 'linear':
+        return colors.Normalize(vmin=0, vmax=high)
+    raise ValueError(f"norm must be 'log', 'eq', 'linear' or a Normalize, not {norm!r}")
+
+
+def color_ramp(color):
+    """A colormap from near-white up to a single named color, e.g. 'green'."""
+    return colors.LinearSegmentedColormap.from_list(f'ramp_{color}', ['#f4f4f4', color])
+
+
+def density_scatter(x, y, ax=None, values=None, norm='log', cmap='viridis',
+                    shape=None, extent=None, **kwargs):
+    """Draw x vs y as a pixel-resolution density image instead of markers.
+
+    norm:   'log' (default), 'eq' (histogram-equalized) or 'linear'
+    values: color each pixel by the mean of these values instead of the count
+            (the density version of scatter(x, y, c=values))
+    shape:  (rows, cols) of the grid; defaults to the pixel size of the axes
+    Extra keyword arguments go to imshow(). Returns the AxesImage, so it can be
+    passed to plt.colorbar().
+    """
+    ax = ax or plt.gca()
+    shape = shape or pixel_shape(ax)
+    counts, extent = density_grid(x, y, shape, extent)
+
+    if values is None:
+        image = counts.astype(float)
+        norm = make_norm(norm, counts)
+    else:
+        sums, _ = density_grid(x, y, shape, extent, values=values)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            image = sums / counts
+        if not isinstance(norm, colors.Normalize):
+            norm = None  # mean values: plain linear scale, like scatter(c=...)
+
+    # Empty pixels stay transparent so the grid and background show through
+    image = np.ma.masked_where(counts == 0, image)
+    kwargs.setdefault('interpolation', 'nearest')
+    artist = ax.imshow(image, origin='lower', extent=extent, aspect='auto',
+                       norm=norm, cmap=cmap, **kwargs)
+    return artist
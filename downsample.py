@@ -0,0 +1,141 @@
+"""
+Outlier-preserving downsampling for scatter plots.
+
+Plotting every song of a huge catalog with plt.scatter() is slow, and a uniform
+random subsample mostly keeps the dense middle while dropping exactly the
+points the lessons talk about: the mega-hits, the flops, the odd outliers.
+thin_indices() picks at most `budget` points instead:
+
+1. extremes are always kept: a share of the budget (`extremes`, 10% by
+   default) goes to the lowest and highest points of x, y and (optionally)
+   the color/size values
+2. the rest are binned into a cells x cells grid, and a per-cell cap is
+   chosen so the capped counts fill the remaining budget ("water filling"):
+   sparse cells keep every point, dense cells are thinned to the cap
+3. inside a dense cell each point is kept with probability cap / count, so
+   the kept points are a uniform sample of that cell
+
+Everything is a handful of NumPy passes over the arrays (no Python loop per
+point or per cell), so it costs much less than drawing the dropped markers.
+
+    keep, report = thin_indices(danceability, energy, budget=20_000, values=popularity)
+    plt.scatter(danceability[keep], energy[keep], c=popularity[keep])
+    print(format_report(report))
+
+Usage:
+    python downsample.py 5000000 --budget 20000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+CELLS = 64
+EXTREMES = 0.1
+
+
+def _tail_indices(values, k):
+    """Indices of the k lowest and k highest values (NaNs count as highest)."""
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if 2 * k >= len(values):
+        return np.arange(len(values))
+    order = np.argpartition(values, [k - 1, len(values) - k])
+    return np.concatenate([order[:k], order[len(values) - k:]])
+
+
+def _cell_cap(counts, budget):
+    """Largest per-cell cap with sum(min(counts, cap)) <= budget."""
+    low, high = 0, int(counts.max(initial=0))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if np.minimum(counts, middle).sum() <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _as_float(values):
+    """Floats as they are (float32 stays float32); integers as float32, so offsets can't overflow."""
+    values = np.asarray(values)
+    return values if values.dtype.kind == 'f' else values.astype(np.float32)
+
+
+def thin_indices(x, y, budget, values=(), cells=CELLS, extremes=EXTREMES, seed=0):
+    """Indices (sorted) of at most about `budget` points worth drawing, plus a report dict.
+
+    values: extra arrays (or one array) whose extremes must also survive, e.g.
+            the c= or s= array of the scatter
+    Points with a non-finite x or y are dropped (scatter can't draw them).
+    """
+    x = _as_float(x)
+    y = _as_float(y)
+    values = [values] if isinstance(values, np.ndarray) else list(values)
+    total = len(x)
+    finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(finite) <= budget:
+        return finite, {'total': total, 'kept': len(finite), 'dropped': total - len(finite),
+                        'extremes': 0, 'cell_cap': float('inf')}
+
+    x, y = x[finite], y[finite]
+    arrays = [x, y] + [_as_float(v)[finite] for v in values]
+    per_tail = int(budget * extremes) // (2 * len(arrays))
+    forced = np.zeros(len(finite), dtype=bool)
+    for array in arrays:
+        forced[_tail_indices(array, per_tail)] = True
+    n_forced = int(forced.sum())
+
+    # Grid cell of every remaining point
+    candidates = np.flatnonzero(~forced)
+    cx, cy = x[candidates], y[candidates]
+    col = np.clip(((cx - x.min()) * (cells / max(np.ptp(x), 1e-12))).astype(np.intp), 0, cells - 1)
+    row = np.clip(((cy - y.min()) * (cells / max(np.ptp(y), 1e-12))).astype(np.intp), 0, cells - 1)
+    cell = row * cells + col
+    counts = np.bincount(cell, minlength=cells * cells)
+
+    remaining = max(budget - n_forced, 0)
+    cap = _cell_cap(counts, remaining)
+    # Spread what the integer cap leaves over the dense cells, so the budget is used up
+    dense = counts > cap
+    if dense.any():
+        cap += (remaining - np.minimum(counts, cap).sum()) / dense.sum()
+    keep_probability = np.minimum(counts, cap) / np.maximum(counts, 1)
+    rng = np.random.default_rng(seed)
+    chosen = candidates[rng.random(len(candidates)) < keep_probability[cell]]
+
+    keep = np.sort(finite[np.concatenate([np.flatnonzero(forced), chosen])])
+    return keep, {'total': total, 'kept': len(keep), 'dropped': total - len(keep),
+                  'extremes': n_forced, 'cell_cap': float(cap)}
+
+
+def format_report(report):
+    share = report['dropped'] / max(report['total'], 1)
+    return (f"kept {report['kept']:,} of {report['total']:,} points, dropped {report['dropped']:,} "
+            f"({share:.1%}); {report['extremes']:,} extremes always kept, "
+            f"dense cells capped at {report['cell_cap']:.1f} points")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Try the outlier-preserving downsampler on synthetic songs.')
+    parser.add_argument('n_songs', type=int)
+    parser.add_argument('--budget', type=int, default=20_000)
+    parser.add_argument('--cells', type=int, default=CELLS)
+    parser.add_argument('--extremes', type=float, default=EXTREMES, help='share of the budget kept for extremes')
+    args = parser.parse_args(argv)
+
+    from genre_data import genre_songs
+    songs = genre_songs(args.n_songs)
+    start = time.perf_counter()
+    keep, report = thin_indices(songs['danceability'], songs['energy'], args.budget,
+                                values=songs['popularity'], cells=args.cells, extremes=args.extremes)
+    elapsed = time.perf_counter() - start
+    print(f'✂️  {format_report(report)} in {elapsed * 1000:.0f} ms')
+    kept = songs['popularity'][keep]
+    print(f"   popularity range kept: {kept.min():.1f}-{kept.max():.1f} "
+          f"(all songs: {songs['popularity'].min():.1f}-{songs['popularity'].max():.1f})")
+
+
+if __name__ == '__main__':
+    main()
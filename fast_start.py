@@ -0,0 +1,133 @@
+"""
+Startup-optimized entry point for render workers.
+
+Render workers start the lesson builds thousands of times, and most of a short
+run is spent importing. This entry point:
+- picks the Agg backend before pyplot is imported (no GUI backend probing)
+- keeps pandas out: lesson_figures and its helper modules (all imported up
+  front, together with pyplot and the PIL it brings) never need it, and the
+  CSV loaders import it only when they read a file
+- warms matplotlib's font lookup once per process, so forked workers and
+  later figures skip it
+
+`report` prints where the import time goes (python -X importtime) and the
+time to the first figure on disk, and fails when that exceeds a budget, so
+startup regressions get caught.
+
+Usage:
+    python fast_start.py render part5_music_dashboard --out figures
+    python fast_start.py report --budget-ms 1500
+"""
+
+import os
+
+os.environ.setdefault('MPLBACKEND', 'Agg')  # must happen before anything imports pyplot
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+LESSON_DIR = Path(__file__).resolve().parent
+REPORT_MODULES = ['numpy', 'matplotlib.pyplot', 'lesson_figures']
+
+_fonts_warm = False
+
+
+def warm_font_cache(plt):
+    """Draw a tiny figure once so the regular and bold fonts are found and loaded."""
+    fig = plt.figure(figsize=(1, 1))
+    fig.suptitle('Warm', fontweight='bold')
+    fig.add_subplot().set_title('up')
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def prepare():
+    """Agg backend, pyplot imported and fonts warmed; cheap after the first call."""
+    global _fonts_warm
+    from headless_render import use_headless
+    plt = use_headless()
+    if not _fonts_warm:
+        warm_font_cache(plt)
+        _fonts_warm = True
+    return plt
+
+
+def render(names, out_dir='figures', fmt='png', dpi=100):
+    plt = prepare()
+    import lesson_figures
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    for name in names:
+        fig = lesson_figures.build_figure(name)
+        fig.savefig(Path(out_dir) / f'{name}.{fmt}', dpi=dpi)
+        plt.close(fig)
+
+
+def import_times(module):
+    """[(cumulative_ms, self_ms, module)] for one import, from python -X importtime."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, cwd=LESSON_DIR,
+                            env={**os.environ, 'MPLBACKEND': 'Agg'})
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, name.rstrip()))
+    return rows
+
+
+def time_to_first_figure(name='part1_figsize_wide'):
+    """Wall time of a fresh process that renders one figure to disk, in ms."""
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, __file__, 'render', name, '--out', tmp],
+                       check=True, cwd=LESSON_DIR)
+        return (time.perf_counter() - start) * 1000
+
+
+def report(modules=REPORT_MODULES, top=12, budget_ms=None):
+    """Print the import-time report; returns False if time-to-first-figure is over budget."""
+    for module in modules:
+        rows = import_times(module)
+        total = next((row[0] for row in rows if row[2].strip() == module), 0.0)
+        print(f'\n📦 import {module}: {total:.0f} ms')
+        for cumulative, self_ms, name in sorted(rows, reverse=True)[1:top + 1]:
+            print(f'   {cumulative:8.1f} ms cumulative  {self_ms:7.1f} ms self  {name}')
+
+    first = time_to_first_figure()
+    print(f'\n🖼️  time to first figure: {first:.0f} ms')
+    if budget_ms is not None and first > budget_ms:
+        print(f'❌ over the {budget_ms:.0f} ms budget')
+        return False
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fast-starting lesson renderer.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    render_parser = commands.add_parser('render', help='render figures with minimal startup')
+    render_parser.add_argument('names', nargs='+')
+    render_parser.add_argument('--out', default='figures')
+    render_parser.add_argument('--format', default='png')
+    render_parser.add_argument('--dpi', type=int, default=100)
+
+    report_parser = commands.add_parser('report', help='import-time and time-to-first-figure report')
+    report_parser.add_argument('--modules', nargs='+', default=REPORT_MODULES)
+    report_parser.add_argument('--top', type=int, default=12)
+    report_parser.add_argument('--budget-ms', type=float, default=None,
+                               help='exit with status 1 if the first figure takes longer')
+
+    args = parser.parse_args(argv)
+    if args.command == 'render':
+        render(args.names, args.out, args.format, args.dpi)
+    elif not report(args.modules, args.top, args.budget_ms):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+Content-addressed disk cache for rendered lesson figures.
+
+The nightly deck rebuild re-renders every figure even when nothing about it
+changed. Here each figure gets a key: a SHA-256 over
+- the arguments its recipe is actually called with (input arrays by dtype,
+  shape and bytes; options and defaults by value)
+- the output format, dpi and size budget
+- the matplotlib and NumPy versions
+- the source of the rendering modules (editing any of them re-renders)
+
+Finished files live in a cache directory as <key>.<format>. A hit only copies
+the file; a miss renders and stores it. The directory has a size cap and
+evicts the least recently used files (a hit refreshes a file's mtime). New
+entries are written to a temporary name and renamed into place, so parallel
+workers can share one cache.
+
+    cache = FigureCache('.figure_cache', max_bytes=512 * 1024 ** 2)
+    key = figure_key('part5_music_dashboard', data, 'png', 100)
+    if not cache.fetch(key, 'png', 'figures/part5_music_dashboard.png'):
+        ...render, then cache.store(key, 'png', 'figures/part5_music_dashboard.png')
+
+Usage:
+    python parallel_render.py --cache                 # render through the default cache
+    python figure_cache.py info | clear [--cache-size 512MB]
+"""
+
+import argparse
+import hashlib
+import inspect
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+LESSON_DIR = Path(__file__).resolve().parent
+CACHE_DIR = LESSON_DIR / '.figure_cache'
+MAX_BYTES = 512 * 1024 ** 2
+CACHE_VERSION = 1
+
+# Everything the recipes' output depends on besides their arguments
+RENDER_MODULES = ['lesson_figures', 'density_scatter', 'downsample', 'genre_data', 'histograms',
+                  'layout_cache', 'song_stats', 'variant_grid', 'vector_export', 'parallel_render']
+
+_code_digest = None
+
+
+def code_digest():
+    """SHA-256 of the rendering modules' source, computed once per process."""
+    global _code_digest
+    if _code_digest is None:
+        digest = hashlib.sha256()
+        for module in RENDER_MODULES:
+            digest.update((LESSON_DIR / f'{module}.py').read_bytes())
+        _code_digest = digest.hexdigest()
+    return _code_digest
+
+
+def _update(digest, value):
+    """Feed one argument value into the hash (arrays by content, containers recursively)."""
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest.update(f'ndarray{value.dtype.str}{value.shape}'.encode())
+        digest.update(value.data)
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            _update(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f'dict{len(value)}'.encode())
+        for key in sorted(value):
+            _update(digest, key)
+            _update(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+def figure_key(name, data, fmt='png', dpi=100, max_bytes=None, **options):
+    """Cache key of one figure: what draw_figure(name, data, **options) would be called with."""
+    import matplotlib
+    from lesson_figures import FIGURES
+    signature = inspect.signature(FIGURES[name][1])
+    options = {key: value for key, value in options.items() if key in signature.parameters}
+    arguments = signature.bind(**data, **options)
+    arguments.apply_defaults()
+
+    digest = hashlib.sha256()
+    _update(digest, [CACHE_VERSION, name, fmt, dpi, max_bytes,
+                     matplotlib.__version__, np.__version__, code_digest()])
+    _update(digest, dict(arguments.arguments))
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """Directory of rendered figures keyed by figure_key(), capped at max_bytes (LRU)."""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # No evict() here: `info` must not delete files stored under a larger cap; store() evicts
+
+    def _path(self, key, fmt):
+        return self.directory / f'{key}.{fmt}'
+
+    def fetch(self, key, fmt, destination):
+        """Copy a cached figure to destination; False on a miss."""
+        cached = self._path(key, fmt)
+        try:
+            shutil.copyfile(cached, destination)
+            os.utime(cached)  # most recently used
+        except FileNotFoundError:  # never stored, or evicted by another worker
+            return False
+        return True
+
+    def store(self, key, fmt, source):
+        """Add a rendered file to the cache, then evict down to the size cap."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, self._path(key, fmt))
+        self.evict()
+
+    def entries(self):
+        """[(mtime, size, path)] of the cached files, oldest first."""
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix == '.tmp':
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self):
+        """Delete least recently used files until the cache fits in max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def info(self):
+        entries = self.entries()
+        return {'directory': str(self.directory), 'files': len(entries),
+                'bytes': sum(size for _, size, _ in entries), 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+
+def main(argv=None):
+    from vector_export import parse_size
+    parser = argparse.ArgumentParser(description='Inspect or clear the rendered-figure cache.')
+    parser.add_argument('command', choices=['info', 'clear'])
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR))
+    parser.add_argument('--cache-size', type=parse_size, default=MAX_BYTES,
+                        help='the cap the renders use, e.g. 512MB (reported by info)')
+    args = parser.parse_args(argv)
+
+    cache = FigureCache(args.cache_dir, args.cache_size)
+    if args.command == 'clear':
+        cache.clear()
+    info = cache.info()
+    print(f"🗄️  {info['directory']}: {info['files']} figures, {info['bytes'] / 1024 ** 2:.1f} MB "
+          f"(cap {info['max_bytes'] / 1024 ** 2:.0f} MB)")
+
+
+if __name__ == '__main__':
+    main()
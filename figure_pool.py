@@ -0,0 +1,190 @@
+"""
+Bounded figure lifecycle for long-running render loops.
+
+The lesson scripts never call plt.close(), so every plt.figure() stays
+registered with pyplot. A process that loops the recipes over many datasets
+grows without bound and matplotlib warns once more than 20 figures are open.
+
+FigurePool hands out pyplot figures and keeps their number bounded:
+- at most max_live figures are handed out at once; asking for one more
+  recycles the oldest (save a figure before asking for max_live more)
+- a recycled or released figure is cleared (fig.clear()) and parked per
+  (figsize, dpi), up to max_idle per size; the next figure of that size
+  reuses it, so its canvas and Agg buffer are not allocated again
+- figures that are closed elsewhere (plt.close(fig)) are simply forgotten
+
+lesson_figures.new_figure() goes through the pool once it is installed:
+
+    from figure_pool import FigurePool
+    pool = lesson_figures.use_figure_pool(FigurePool(max_live=4))
+    rng = np.random.default_rng(7)
+    for seed in range(10_000):
+        fig = lesson_figures.build_figure('part5_music_dashboard', rng)
+        fig.savefig(f'dashboards/{seed}.png')
+        pool.release(fig)
+    print(format_memory(pool.memory()))   # per-figure buffer and data bytes
+
+Usage:
+    python figure_pool.py --renders 2000 --max-live 4
+    python figure_pool.py --renders 200 --no-pool     # the leak, for comparison
+"""
+
+import argparse
+import io
+import resource
+import time
+import warnings
+from collections import defaultdict, deque
+
+import numpy as np
+
+MAX_LIVE = 8
+MAX_IDLE = 2
+
+
+def _size_key(figsize, dpi):
+    return tuple(round(float(size), 3) for size in figsize), float(dpi)
+
+
+def figure_memory(fig):
+    """Estimated bytes held by one figure: its Agg buffer and the data arrays of its artists."""
+    from matplotlib.collections import Collection
+    from matplotlib.image import AxesImage
+    from matplotlib.lines import Line2D
+
+    renderer = getattr(fig.canvas, 'renderer', None)
+    buffer_bytes = int(renderer.width * renderer.height * 4) if renderer is not None else 0
+    data_bytes = 0
+    artists = fig.findobj()
+    for artist in artists:
+        if isinstance(artist, Line2D):
+            data_bytes += np.asarray(artist.get_xydata()).nbytes
+        elif isinstance(artist, Collection):
+            data_bytes += np.asarray(artist.get_offsets()).nbytes
+            if artist.get_array() is not None:
+                data_bytes += np.asarray(artist.get_array()).nbytes
+        elif isinstance(artist, AxesImage) and artist.get_array() is not None:
+            data_bytes += np.asarray(artist.get_array()).nbytes
+    width, height = fig.canvas.get_width_height()
+    return {'number': fig.number, 'size_px': (width, height), 'artists': len(artists),
+            'buffer_bytes': buffer_bytes, 'data_bytes': data_bytes}
+
+
+class FigurePool:
+    """Caps live pyplot figures and reuses cleared figures of the same size."""
+
+    def __init__(self, max_live=MAX_LIVE, max_idle=MAX_IDLE):
+        self.max_live = max_live
+        self.max_idle = max_idle
+        self.live = deque()
+        self.idle = defaultdict(list)  # (figsize, dpi) -> cleared figures
+        self.stats = {'created': 0, 'reused': 0, 'recycled': 0, 'closed': 0}
+
+    def figure(self, figsize, dpi=None):
+        """A blank pyplot figure of this size, made current (like plt.figure(figsize=...))."""
+        import matplotlib.pyplot as plt
+        dpi = dpi or plt.rcParams['figure.dpi']
+        self._forget_closed()
+        while len(self.live) >= self.max_live:
+            self.stats['recycled'] += 1
+            self.release(self.live[0])
+
+        idle = self.idle[_size_key(figsize, dpi)]
+        if idle:
+            fig = idle.pop()
+            plt.figure(fig.number)  # make it current again for plt.subplot() & co.
+            self.stats['reused'] += 1
+        else:
+            fig = plt.figure(figsize=figsize, dpi=dpi)
+            self.stats['created'] += 1
+        self.live.append(fig)
+        return fig
+
+    def release(self, fig):
+        """Done with fig: clear it and keep it for reuse (or close it if enough are idle)."""
+        import matplotlib.pyplot as plt
+        if fig in self.live:
+            self.live.remove(fig)
+        if not plt.fignum_exists(fig.number):
+            return
+        idle = self.idle[_size_key(fig.get_size_inches(), fig.dpi)]
+        if len(idle) < self.max_idle:
+            fig.clear()
+            idle.append(fig)
+        else:
+            plt.close(fig)
+            self.stats['closed'] += 1
+
+    def _forget_closed(self):
+        import matplotlib.pyplot as plt
+        self.live = deque(fig for fig in self.live if plt.fignum_exists(fig.number))
+        for key, figures in self.idle.items():
+            figures[:] = [fig for fig in figures if plt.fignum_exists(fig.number)]
+
+    def close_all(self):
+        import matplotlib.pyplot as plt
+        for fig in list(self.live) + [fig for figures in self.idle.values() for fig in figures]:
+            plt.close(fig)
+        self.live.clear()
+        self.idle.clear()
+
+    def memory(self):
+        """figure_memory() of every figure the pool holds, live ones first."""
+        self._forget_closed()
+        records = [dict(figure_memory(fig), state='live') for fig in self.live]
+        records += [dict(figure_memory(fig), state='idle') for figures in self.idle.values() for fig in figures]
+        return records
+
+
+def rss_mb():
+    """Current resident set size of this process in MB (Linux), or the peak elsewhere."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 1024 ** 2
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def format_memory(records):
+    lines = [f"  #{r['number']:<4} {r['state']:<5} {'x'.join(map(str, r['size_px'])):>9} "
+             f"{r['artists']:>5} artists  buffer {r['buffer_bytes'] / 1024 ** 2:5.1f} MB  "
+             f"data {r['data_bytes'] / 1024:8.1f} KB" for r in records]
+    total = sum(r['buffer_bytes'] + r['data_bytes'] for r in records)
+    return '\n'.join(lines + [f'  {len(records)} figures, about {total / 1024 ** 2:.1f} MB'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render lesson figures in a loop and watch the memory.')
+    parser.add_argument('--renders', type=int, default=1000)
+    parser.add_argument('--max-live', type=int, default=MAX_LIVE)
+    parser.add_argument('--max-idle', type=int, default=MAX_IDLE)
+    parser.add_argument('--no-pool', action='store_true', help='plain plt.figure() and never close (the leak)')
+    args = parser.parse_args(argv)
+
+    from headless_render import use_headless
+    plt = use_headless()
+    import lesson_figures
+
+    pool = None if args.no_pool else lesson_figures.use_figure_pool(FigurePool(args.max_live, args.max_idle))
+    names = list(lesson_figures.FIGURES)
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # "More than 20 figures" in --no-pool mode
+        for index in range(args.renders):
+            name = names[index % len(names)]
+            fig = lesson_figures.build_figure(name, lesson_figures.figure_rng(name, index))
+            fig.savefig(io.BytesIO(), format='png')
+            if pool is not None:
+                pool.release(fig)
+            if (index + 1) % max(args.renders // 10, 1) == 0:
+                print(f'  {index + 1:>6} renders   {len(plt.get_fignums()):>4} open figures   '
+                      f'RSS {rss_mb():7.1f} MB   {time.perf_counter() - start:6.1f}s')
+
+    if pool is not None:
+        print(f"\n♻️  {pool.stats['created']} figures created, {pool.stats['reused']} reused, "
+              f"{pool.stats['recycled']} recycled, {pool.stats['closed']} closed")
+        print(format_memory(pool.memory()))
+
+
+if __name__ == '__main__':
+    main()
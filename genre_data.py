@@ -0,0 +1,133 @@
+"""
+Reproducible synthetic song catalogs from the PART 5 genre model.
+
+PART 5 of histogram_scatter_explanation.py simulates pop, dance, ballad and
+rock songs one genre at a time from the global np.random state. This module
+holds the same model as data (GENRES) and generates it with np.random.Generator:
+
+- every (genre, chunk) pair has its own SeedSequence, spawn_key=(genre, chunk),
+  so any chunk can be made on its own, in any process
+- chunk boundaries depend only on chunk_size, never on the number of workers,
+  so the output is bit-identical whether it is made by 1 worker or 64
+- each worker writes its chunk straight to an .npz or .csv shard
+
+Usage:
+    python genre_data.py 50000000 --out catalog/ --workers 8 --format npz
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# share: songs per 20 in the catalog (the lesson's 50/40/60/50 out of 200)
+# dance / energy: Beta(a, b) * scale + shift
+# popularity: dance * w_dance + energy * w_energy + Normal(mean, std)
+GENRES = {
+    'pop':    dict(share=5, dance=(3, 2, 0.8, 0.2), energy=(2, 2, 0.6, 0.4), popularity=(25, 30, 20, 10)),
+    'dance':  dict(share=4, dance=(4, 1, 0.8, 0.2), energy=(3, 1, 0.7, 0.3), popularity=(30, 35, 15, 8)),
+    'ballad': dict(share=6, dance=(1, 4, 0.5, 0.0), energy=(1, 3, 0.4, 0.0), popularity=(0, 0, 45, 20)),
+    'rock':   dict(share=5, dance=(2, 2, 0.7, 0.1), energy=(4, 1, 0.8, 0.2), popularity=(20, 25, 10, 15)),
+}
+GENRE_NAMES = list(GENRES)
+CHUNK_SIZE = 1_000_000
+
+
+def genre_sizes(n_songs):
+    """Songs per genre, in the lesson's proportions (the last genre takes the remainder)."""
+    total_share = sum(spec['share'] for spec in GENRES.values())
+    sizes = [n_songs * spec['share'] // total_share for spec in GENRES.values()]
+    sizes[-1] = n_songs - sum(sizes[:-1])
+    return dict(zip(GENRE_NAMES, sizes))
+
+
+def genre_features(rng, genre, n):
+    """Danceability, energy and (unclipped) popularity for n songs of one genre."""
+    spec = GENRES[genre]
+    a, b, scale, shift = spec['dance']
+    dance = rng.beta(a, b, n) * scale + shift
+    a, b, scale, shift = spec['energy']
+    energy = rng.beta(a, b, n) * scale + shift
+    w_dance, w_energy, mean, std = spec['popularity']
+    popularity = dance * w_dance + energy * w_energy + rng.normal(mean, std, n)
+    return dance, energy, popularity
+
+
+def chunk_plan(n_songs, chunk_size=CHUNK_SIZE):
+    """[(genre, chunk_index, size)] covering the whole catalog."""
+    plan = []
+    for genre, size in genre_sizes(n_songs).items():
+        for chunk_index, start in enumerate(range(0, size, chunk_size)):
+            plan.append((genre, chunk_index, min(chunk_size, size - start)))
+    return plan
+
+
+def generate_chunk(genre, chunk_index, size, seed=42):
+    """One chunk of one genre as a dict of arrays (depends only on its arguments)."""
+    sequence = np.random.SeedSequence(seed, spawn_key=(GENRE_NAMES.index(genre), chunk_index))
+    dance, energy, popularity = genre_features(np.random.default_rng(sequence), genre, size)
+    return {
+        'genre': np.full(size, GENRE_NAMES.index(genre), dtype=np.uint8),
+        'danceability': dance,
+        'energy': energy,
+        'popularity': np.clip(popularity, 0, 100),
+    }
+
+
+def write_shard(task, out_dir, fmt='npz', seed=42):
+    """Generate one chunk and write it as a shard. Runs inside a worker process."""
+    genre, chunk_index, size = task
+    columns = generate_chunk(genre, chunk_index, size, seed)
+    path = Path(out_dir) / f'songs-{genre}-{chunk_index:05d}.{fmt}'
+    if fmt == 'npz':
+        np.savez(path, **columns)
+    elif fmt == 'csv':
+        import pandas as pd
+        frame = pd.DataFrame(columns)
+        frame['genre'] = np.array(GENRE_NAMES)[frame['genre']]
+        frame.to_csv(path, index=False, float_format='%.6f')
+    else:
+        raise ValueError(f"format must be 'npz' or 'csv', not {fmt!r}")
+    return str(path)
+
+
+def generate_catalog(n_songs, out_dir, seed=42, chunk_size=CHUNK_SIZE, workers=None, fmt='npz'):
+    """Write the whole catalog as shards, in parallel. Returns the shard paths in order."""
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    plan = chunk_plan(n_songs, chunk_size)
+    if workers == 1:
+        return [write_shard(task, out_dir, fmt, seed) for task in plan]
+    workers = min(workers or os.cpu_count() or 1, len(plan))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(write_shard, plan, [out_dir] * len(plan),
+                             [fmt] * len(plan), [seed] * len(plan)))
+
+
+def genre_songs(n_songs, seed=42, chunk_size=CHUNK_SIZE):
+    """The catalog in memory, as one dict of arrays (same data as the shards)."""
+    chunks = [generate_chunk(genre, chunk_index, size, seed)
+              for genre, chunk_index, size in chunk_plan(n_songs, chunk_size)]
+    return {column: np.concatenate([chunk[column] for chunk in chunks]) for column in chunks[0]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic genre song catalog as shards.')
+    parser.add_argument('n_songs', type=int)
+    parser.add_argument('--out', default='catalog')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per core)')
+    parser.add_argument('--format', choices=['npz', 'csv'], default='npz')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    shards = generate_catalog(args.n_songs, args.out, args.seed, args.chunk_size, args.workers, args.format)
+    print(f'🎵 {args.n_songs:,} songs in {len(shards)} shards under {args.out}/ '
+          f'({time.perf_counter() - start:.2f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+"""
+Grade homework submissions headlessly, in parallel, against reference figures.
+
+Every student of the Early Bird Data Detective Challenge (matplotlib_homework.md)
+draws the same three figures from create_student_dataset(). Grading a class
+used to mean running each script by hand, with a GUI window for every plot.
+
+This runner:
+- imports numpy, pandas and pyplot (on Agg) once, then forks one child
+  process per submission, at most --workers at a time
+- limits every child's address space (--memory-mb) and kills children that
+  run longer than --timeout seconds
+- replaces plt.show() in the child with a HeadlessShow that saves every
+  figure (figures that are never shown are saved when the script ends); the
+  student's prints go to output.log next to the figures
+- compares figure N of each submission with figure N of the reference
+  solution by perceptual hash (image_hash.py)
+- writes one CSV report with a row per student
+
+The reference solution defaults to the code blocks of matplotlib_homework.md.
+A submission is a .py file or a Jupyter notebook (.ipynb). Notebook code
+cells are joined, and lines with % or ! magics are dropped.
+
+Usage:
+    python grade_submissions.py submissions/ --workers 8
+    python grade_submissions.py submissions/ --reference solution.py --timeout 30 --memory-mb 2048
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import wait
+from pathlib import Path
+
+LESSON_DIR = Path(__file__).resolve().parent
+HOMEWORK_MD = LESSON_DIR / 'matplotlib_homework.md'
+
+# One name per figure the homework asks for, in order
+FIGURE_NAMES = ['step2_histogram', 'step3_scatter_panels', 'step4_color_coded']
+SUBMISSION_SUFFIXES = {'.py', '.ipynb'}
+TIMEOUT_S = 60
+MEMORY_MB = 1024
+MAX_DISTANCE = 0.1  # share of hash bits that may differ for a figure to match
+REFERENCE_ID = '_reference'
+
+
+def homework_code(md_path=HOMEWORK_MD):
+    """The homework's ```python blocks as one script (the reference solution)."""
+    text = Path(md_path).read_text(encoding='utf-8')
+    return '\n\n'.join(re.findall(r'```python\n(.*?)```', text, flags=re.DOTALL))
+
+
+def submission_code(path):
+    """Source of a .py submission, or the code cells of a notebook."""
+    path = Path(path)
+    if path.suffix != '.ipynb':
+        return path.read_text(encoding='utf-8', errors='replace')
+    cells = json.loads(path.read_text(encoding='utf-8'))['cells']
+    sources = [''.join(cell['source']) for cell in cells if cell['cell_type'] == 'code']
+    lines = '\n'.join(sources).splitlines()
+    return '\n'.join(line for line in lines if not line.lstrip().startswith(('%', '!')))
+
+
+def find_submissions(path):
+    """{student_id: file} for one submission file or every submission under a directory."""
+    path = Path(path)
+    if path.is_file():
+        return {path.stem: path}
+    files = sorted(file for file in path.rglob('*') if file.suffix in SUBMISSION_SUFFIXES)
+    return {'_'.join(file.relative_to(path).with_suffix('').parts): file for file in files}
+
+
+def _run_child(code, filename, out_dir, memory_mb):
+    """Body of a forked child: run one submission and write manifest.json to out_dir."""
+    limit = memory_mb * 1024 ** 2
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    os.chdir(out_dir)
+    log = open('output.log', 'w', buffering=1)
+    sys.stdout = sys.stderr = log
+    sys.stdin = open(os.devnull)
+
+    from headless_render import HeadlessShow, use_headless
+    plt = use_headless()
+    show = HeadlessShow(plt, FIGURE_NAMES, out_dir, 'figure', log=lambda message: None)
+    plt.show = show
+
+    status, error = 'ok', None
+    start = time.perf_counter()
+    try:
+        exec(compile(code, filename, 'exec'), {'__name__': '__main__', '__file__': filename})
+    except SystemExit:
+        pass
+    except MemoryError:
+        status, error = 'memory', f'exceeded {memory_mb} MB'
+    except BaseException:
+        status, error = 'error', traceback.format_exc(limit=-1).strip().splitlines()[-1]
+        traceback.print_exc()
+    try:
+        show()  # figures the script created but never showed
+    except Exception:
+        traceback.print_exc()
+
+    manifest = {'status': status, 'error': error, 'run_s': time.perf_counter() - start,
+                'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                'figures': [record['path'] for record in show.records]}
+    with open('manifest.json', 'w') as f:
+        json.dump(manifest, f)
+    log.flush()
+    os._exit(0)
+
+
+def _collect(out_dir, process, timed_out, timeout, run_s):
+    """The child's manifest, or a record of why it didn't write one."""
+    try:
+        with open(Path(out_dir) / 'manifest.json') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        if timed_out:
+            status, error = 'timeout', f'killed after {timeout:g}s'
+        else:
+            status, error = 'crashed', f'exit code {process.exitcode}'
+        return {'status': status, 'error': error, 'run_s': run_s, 'max_rss_mb': None, 'figures': []}
+
+
+def run_submissions(jobs, out_dir, workers=None, timeout=TIMEOUT_S, memory_mb=MEMORY_MB, log=print):
+    """Run {student_id: (code, filename)} in forked children; return {student_id: manifest}."""
+    # Everything the children import anyway is imported once here, before forking
+    from fast_start import prepare
+    prepare()
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+
+    context = multiprocessing.get_context('fork')
+    workers = workers or os.cpu_count() or 1
+    pending = deque(jobs.items())
+    running = {}  # sentinel -> (student_id, process, student_dir, started)
+    results = {}
+    while pending or running:
+        while pending and len(running) < workers:
+            student_id, (code, filename) = pending.popleft()
+            student_dir = Path(out_dir) / student_id
+            student_dir.mkdir(parents=True, exist_ok=True)
+            (student_dir / 'manifest.json').unlink(missing_ok=True)
+            process = context.Process(target=_run_child, args=(code, filename, student_dir.resolve(), memory_mb))
+            process.start()
+            running[process.sentinel] = (student_id, process, student_dir, time.perf_counter())
+
+        next_deadline = min(started for _, _, _, started in running.values()) + timeout
+        wait(list(running), timeout=max(next_deadline - time.perf_counter(), 0))
+        now = time.perf_counter()
+        for sentinel, (student_id, process, student_dir, started) in list(running.items()):
+            timed_out = process.exitcode is None and now - started >= timeout
+            if process.exitcode is None and not timed_out:
+                continue
+            if timed_out:
+                process.kill()
+            process.join()
+            del running[sentinel]
+            results[student_id] = _collect(student_dir, process, timed_out, timeout, now - started)
+            if student_id != REFERENCE_ID:
+                log(f"  {'✅' if results[student_id]['status'] == 'ok' else '❌'} {student_id:<28} "
+                    f"{results[student_id]['status']:<8} {len(results[student_id]['figures'])} figures "
+                    f"{now - started:6.2f}s")
+    return results
+
+
+def grade(manifest, reference_hashes, max_distance=MAX_DISTANCE):
+    """Per-figure hash distances to the reference, and the share of figures that match."""
+    from image_hash import dhash, hash_distance
+    distances = []
+    for index, reference in enumerate(reference_hashes):
+        if index < len(manifest['figures']):
+            distances.append(hash_distance(dhash(manifest['figures'][index]), reference))
+        else:
+            distances.append(None)
+    matched = sum(distance is not None and distance <= max_distance for distance in distances)
+    return distances, matched / max(len(reference_hashes), 1)
+
+
+def grade_class(submissions, out_dir='graded', reference=None, workers=None, timeout=TIMEOUT_S,
+                memory_mb=MEMORY_MB, max_distance=MAX_DISTANCE, report='grades.csv'):
+    """Run the reference and every submission, compare figures and write the CSV report."""
+    from image_hash import dhash
+    submissions = find_submissions(submissions)
+    jobs = {REFERENCE_ID: (submission_code(reference), str(reference)) if reference
+            else (homework_code(), str(HOMEWORK_MD))}
+    jobs.update({student_id: (submission_code(path), str(path)) for student_id, path in submissions.items()})
+
+    results = run_submissions(jobs, out_dir, workers, timeout, memory_mb)
+    reference_result = results.pop(REFERENCE_ID)
+    if reference_result['status'] != 'ok' or not reference_result['figures']:
+        raise RuntimeError(f"reference solution failed: {reference_result['error']}")
+    reference_hashes = [dhash(path) for path in reference_result['figures']]
+    names = [Path(path).stem for path in reference_result['figures']]
+
+    rows = []
+    for student_id, manifest in sorted(results.items()):
+        distances, score = grade(manifest, reference_hashes, max_distance)
+        row = {'student': student_id, 'status': manifest['status'], 'score': round(score, 3),
+               'figures': len(manifest['figures']), 'run_s': round(manifest['run_s'], 2),
+               'max_rss_mb': None if manifest['max_rss_mb'] is None else round(manifest['max_rss_mb'], 1)}
+        row.update({f'{name}_distance': None if distance is None else round(distance, 3)
+                    for name, distance in zip(names, distances)})
+        row['error'] = manifest['error']
+        rows.append(row)
+
+    with open(report, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['student'])
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Grade homework submissions against reference figures.')
+    parser.add_argument('submissions', help='a submission file or a directory of them')
+    parser.add_argument('--reference', default=None, help='reference solution (default: the homework code)')
+    parser.add_argument('--out', default='graded', help='figures and logs per student')
+    parser.add_argument('--report', default='grades.csv')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--timeout', type=float, default=TIMEOUT_S, help='seconds per submission')
+    parser.add_argument('--memory-mb', type=int, default=MEMORY_MB, help='address space limit per submission')
+    parser.add_argument('--max-distance', type=float, default=MAX_DISTANCE,
+                        help='share of hash bits that may differ for a figure to match')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = grade_class(args.submissions, args.out, args.reference, args.workers, args.timeout,
+                       args.memory_mb, args.max_distance, args.report)
+    passed = sum(row['score'] == 1 for row in rows)
+    print(f'\n📝 graded {len(rows)} submissions in {time.perf_counter() - start:.1f}s: '
+          f'{passed} match every reference figure -> {args.report}')
+
+
+if __name__ == '__main__':
+    main()
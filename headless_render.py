@@ -0,0 +1,159 @@
+"""
+Headless batch rendering for the lesson scripts.
+
+Runs histogram_scatter_explanation.py and matplotlib_explanation.py on the
+Agg backend and turns every plt.show() into a file write, so the whole lesson
+set can be built unattended on a server or in CI (no display, no GUI loop).
+
+Usage:
+    python headless_render.py                         # both scripts -> figures/
+    python headless_render.py matplotlib_explanation.py --out build --format svg
+    python headless_render.py --quiet                 # hide the tutorial prints
+    MATPLOT_PROFILE=1 python headless_render.py       # plus a per-call profile at exit
+"""
+
+import argparse
+import contextlib
+import io
+import runpy
+import sys
+import time
+from pathlib import Path
+
+LESSON_DIR = Path(__file__).resolve().parent
+
+# Strip timestamps from vector formats so repeated builds are byte-identical
+SAVE_METADATA = {'svg': {'Date': None}, 'pdf': {'CreationDate': None}}
+
+# One name per plt.show() call, in the order the scripts reach them
+FIGURE_NAMES = {
+    'histogram_scatter_explanation.py': [
+        'part1_test_score_bins',
+        'part2_hist_parameters',
+        'part3_scatter_relationships',
+        'part4_scatter_parameters',
+        'part5_music_dashboard',
+    ],
+    'matplotlib_explanation.py': [
+        'part1_figsize_wide',
+        'part1_figsize_tall',
+        'part2_subplot_row',
+        'part3_grid_2x2',
+        'part3_stack_3x1',
+        'part4_music_lesson',
+        'part5_subplot_numbering',
+        'part6_without_tight_layout',
+        'part6_with_tight_layout',
+    ],
+}
+
+
+def use_headless():
+    """Select the Agg backend (before pyplot loads, if we can) and return pyplot."""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+    plt.ioff()
+    return plt
+
+
+class HeadlessShow:
+    """Drop-in replacement for plt.show() that saves and closes the open figures.
+
+    Every open figure gets the next name from `names` (falling back to
+    `<stem>_figureNN` if the script shows more figures than we have names for).
+    The time since the previous show() is reported as build time, since that
+    is where the script generated its data and created the artists.
+    """
+
+    def __init__(self, plt, names, out_dir, stem, fmt='png', dpi=100, log=print):
+        self.plt = plt
+        self.names = list(names)
+        self.out_dir = Path(out_dir)
+        self.stem = stem
+        self.fmt = fmt
+        self.dpi = dpi
+        self.log = log
+        self.records = []
+        self._last = time.perf_counter()
+
+    def _next_name(self):
+        index = len(self.records)
+        if index < len(self.names):
+            return self.names[index]
+        return f'{self.stem}_figure{index + 1:02d}'
+
+    def __call__(self, *args, **kwargs):
+        build_s = time.perf_counter() - self._last
+        for num in self.plt.get_fignums():
+            fig = self.plt.figure(num)
+            path = self.out_dir / f'{self._next_name()}.{self.fmt}'
+
+            start = time.perf_counter()
+            fig.savefig(path, dpi=self.dpi)
+            save_s = time.perf_counter() - start
+            self.plt.close(fig)
+
+            self.records.append({'name': path.stem, 'path': str(path),
+                                 'build_s': build_s, 'save_s': save_s})
+            self.log(f'  🖼️  {path.name:<34} build {build_s:6.3f}s   save {save_s:6.3f}s')
+            build_s = 0.0
+        self._last = time.perf_counter()
+
+
+def render_script(script, out_dir='figures', fmt='png', dpi=100, quiet=False):
+    """Run one lesson script headlessly and return a record per saved figure."""
+    script = Path(script)
+    if not script.is_absolute() and not script.exists():
+        script = LESSON_DIR / script
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    plt = use_headless()
+    stdout = sys.stdout
+
+    def log(message):
+        print(message, file=stdout, flush=True)
+
+    show = HeadlessShow(plt, FIGURE_NAMES.get(script.name, []), out_dir,
+                        script.stem, fmt=fmt, dpi=dpi, log=log)
+
+    log(f'▶️  {script.name}')
+    original_show = plt.show
+    plt.show = show
+    try:
+        sink = io.StringIO() if quiet else stdout
+        with contextlib.redirect_stdout(sink):
+            runpy.run_path(str(script), run_name='__main__')
+    finally:
+        plt.show = original_show
+        plt.close('all')
+    return show.records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render the lesson figures without a display.')
+    parser.add_argument('scripts', nargs='*', default=list(FIGURE_NAMES),
+                        help='lesson scripts to run (default: both)')
+    parser.add_argument('--out', default='figures', help='output directory')
+    parser.add_argument('--format', default='png', help='png, svg, pdf, ...')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--quiet', action='store_true', help="hide the scripts' own print output")
+    args = parser.parse_args(argv)
+
+    # MATPLOT_PROFILE=1 times every pyplot call per figure (see pyplot_profiler.py)
+    from pyplot_profiler import enable_from_env
+    enable_from_env([name for script in args.scripts for name in FIGURE_NAMES.get(Path(script).name, [])])
+
+    start = time.perf_counter()
+    records = []
+    for script in args.scripts:
+        records += render_script(script, args.out, args.format, args.dpi, args.quiet)
+    total = time.perf_counter() - start
+
+    print(f'\n✅ {len(records)} figures written to {args.out}/ in {total:.2f}s')
+    return records
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,5 @@
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 
 print("📊 Understanding plt.hist() and plt.scatter()")
 print("=" * 60)
@@ -0,0 +1,180 @@
+"""
+Histograms from bin counts instead of raw data.
+
+The teaching transcript loads all of spotify_songs_dataset.csv with
+pd.read_csv() before calling plt.hist(popularity, bins=20). For exports of
+tens of GB that doesn't fit in memory, so here the CSV is read one chunk at a
+time and only the bin counts are kept:
+
+- with a known range (popularity is always 0-100) it takes one pass
+- without one, a first pass finds the min/max and a second pass counts
+
+Peak memory is one chunk of one column, however many rows the file has.
+plot_counts() then draws the counts the way plt.hist() would.
+
+For bin sweeps over data that is already in memory (PART 1 and 2 of
+histogram_scatter_explanation.py draw the same array with 5, 10, 15, 25, 50
+bins), BinCounter sorts the data once and answers each bin count or range
+with a searchsorted over the edges: O(bins * log n) per variant instead of
+re-binning all n values every time.
+
+Usage:
+    python histograms.py spotify_songs_dataset.csv popularity --bins 20 --range 0 100
+"""
+
+import argparse
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+CHUNK_ROWS = 1_000_000
+
+
+def iter_column(csv_path, column, chunksize=CHUNK_ROWS):
+    """Yield one column of a CSV as NumPy arrays of at most chunksize rows (NaNs dropped)."""
+    import pandas as pd  # only needed here; keeps `import histograms` (and the recipes) light
+    for chunk in pd.read_csv(csv_path, usecols=[column], chunksize=chunksize):
+        values = chunk[column].to_numpy()
+        yield values[np.isfinite(values)]
+
+
+def column_range(csv_path, column, chunksize=CHUNK_ROWS):
+    """(min, max) of a CSV column, computed chunk by chunk."""
+    low, high = np.inf, -np.inf
+    for values in iter_column(csv_path, column, chunksize):
+        if values.size:
+            low = min(low, values.min())
+            high = max(high, values.max())
+    if low > high:
+        raise ValueError(f'Column {column!r} in {csv_path} has no numeric values')
+    return float(low), float(high)
+
+
+def stream_histogram(csv_path, column, bins=20, range=None, chunksize=CHUNK_ROWS):
+    """Bin counts and edges for one CSV column without loading the whole file.
+
+    Matches np.histogram(values, bins, range): values outside the range are
+    ignored and the last bin includes its right edge.
+    """
+    if range is None:
+        range = column_range(csv_path, column, chunksize)
+    if range[0] == range[1]:  # a constant column: widen like np.histogram does
+        range = (range[0] - 0.5, range[1] + 0.5)
+    counts = np.zeros(bins, dtype=np.int64)
+    for values in iter_column(csv_path, column, chunksize):
+        counts += np.histogram(values, bins=bins, range=range)[0]
+    return counts, np.linspace(range[0], range[1], bins + 1)
+
+
+class BinCounter:
+    """Histogram counts for any bins/range from one sorted copy of the data.
+
+        counter = BinCounter(song_popularity)
+        for bins in (10, 25, 50):
+            plot_counts(*counter.counts(bins), color='blue', alpha=0.6)
+
+    counts() returns the same (counts, edges) as np.histogram(values, bins, range).
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values).ravel()
+        self.sorted = np.sort(values[np.isfinite(values)])
+        self._cache = {}
+
+    def __len__(self):
+        return self.sorted.size
+
+    def edges(self, bins=10, range=None):
+        """Bin edges exactly as np.histogram would pick them (float32 data gets float32 edges)."""
+        if np.ndim(bins) == 1:
+            return np.asarray(bins, dtype=float)
+        if range is None:
+            range = (self.sorted[0], self.sorted[-1]) if self.sorted.size else (0.0, 1.0)
+        low, high = range
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        dtype = np.result_type(low, high, self.sorted)  # NumPy's choice, so the bins compare alike
+        if np.issubdtype(dtype, np.integer):
+            dtype = np.result_type(dtype, float)
+        return np.linspace(low, high, bins + 1, dtype=dtype)
+
+    def _search(self, edges, side):
+        """np.searchsorted(self.sorted, edges, side) without converting the data to float64.
+
+        Mixed dtypes make NumPy copy the whole sorted array to the common type,
+        so float32/int data is searched with edges moved to the nearest value of
+        its own dtype on the correct side: v < e exactly when v < (the smallest
+        value >= e), and v <= e exactly when v <= (the largest value <= e).
+        """
+        dtype = self.sorted.dtype
+        if dtype == edges.dtype or not self.sorted.size:
+            return np.searchsorted(self.sorted, edges, side=side)
+        if dtype.kind == 'f':
+            converted = edges.astype(dtype)
+            if side == 'left':
+                converted = np.where(converted < edges, np.nextafter(converted, dtype.type(np.inf)), converted)
+            else:
+                converted = np.where(converted > edges, np.nextafter(converted, dtype.type(-np.inf)), converted)
+            return np.searchsorted(self.sorted, converted, side=side)
+        info = np.iinfo(dtype)
+        rounded = np.ceil(edges) if side == 'left' else np.floor(edges)
+        positions = np.searchsorted(self.sorted, np.clip(rounded, info.min, info.max).astype(dtype), side=side)
+        positions[rounded > info.max] = self.sorted.size
+        positions[rounded < info.min] = 0
+        return positions
+
+    def counts(self, bins=10, range=None):
+        """(counts, edges) for the given bins, cached per (bins, range)."""
+        key = (tuple(bins), None) if np.ndim(bins) == 1 else (bins, None if range is None else tuple(range))
+        if key not in self._cache:
+            edges = self.edges(bins, range)
+            # Every bin is half-open [a, b) except the last one, which includes its right edge
+            positions = self._search(edges, 'left')
+            positions[-1] = self._search(edges[-1:], 'right')[0]
+            self._cache[key] = (np.diff(positions), edges)
+        return self._cache[key]
+
+
+def plot_counts(counts, edges, ax=None, histtype='bar', **kwargs):
+    """Draw precomputed histogram counts like plt.hist() would.
+
+    histtype='bar' draws one bar per bin (so edgecolor outlines each bar);
+    histtype='step' or 'stepfilled' draws a single outline with plt.stairs().
+    """
+    ax = ax or plt.gca()
+    if histtype == 'bar':
+        return ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', **kwargs)
+    return ax.stairs(counts, edges, fill=histtype == 'stepfilled', **kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Histogram of one CSV column, read in chunks.')
+    parser.add_argument('csv_path')
+    parser.add_argument('column')
+    parser.add_argument('--bins', type=int, default=20)
+    parser.add_argument('--range', type=float, nargs=2, default=None, metavar=('MIN', 'MAX'),
+                        help='known value range (skips the min/max pass)')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--out', default=None, help='image file (default: <column>_hist.png)')
+    args = parser.parse_args(argv)
+
+    from headless_render import use_headless
+    use_headless()
+
+    counts, edges = stream_histogram(args.csv_path, args.column, args.bins, args.range, args.chunksize)
+    print(f'📊 {counts.sum():,} values of {args.column!r} in {args.bins} bins')
+
+    plt.figure(figsize=(10, 6))
+    plot_counts(counts, edges, color='skyblue', alpha=0.7, edgecolor='black')
+    plt.title(f'Distribution of {args.column}', fontsize=16, fontweight='bold')
+    plt.xlabel(args.column)
+    plt.ylabel('Number of Songs')
+    plt.grid(True, alpha=0.3)
+    out = args.out or f'{args.column}_hist.png'
+    plt.savefig(out)
+    plt.close()
+    print(f'✅ Saved {out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Perceptual image hashes for comparing rendered figures.
+
+Two renders of the same figure are rarely byte-identical: another matplotlib
+version, a different dpi or a slightly different color all change the
+pixels. A difference hash (dHash) only keeps the coarse structure. The image
+is shrunk to a (size x size+1) grayscale thumbnail, and each bit records
+whether a pixel is brighter than its right neighbour. Similar figures give
+hashes that differ in few bits, so the Hamming distance between two hashes
+is a cheap "how different do these look" score.
+
+    distance = hash_distance(dhash('figure.png'), dhash('reference.png'))
+    same = distance <= 0.1   # share of differing bits
+
+When the hashes differ, pixel_rms() gives the exact (and much slower)
+answer on full-size images.
+
+Usage:
+    python image_hash.py figures/part5_music_dashboard.png other/part5_music_dashboard.png
+"""
+
+import argparse
+
+import numpy as np
+from PIL import Image
+
+HASH_SIZE = 16
+
+
+def load_gray(image, size):
+    """A (rows, cols) float array of the image as grayscale, resized to size=(cols, rows)."""
+    if not isinstance(image, Image.Image):
+        image = Image.open(image)
+    return np.asarray(image.convert('L').resize(size, Image.Resampling.LANCZOS), dtype=np.float32)
+
+
+def dhash(image, size=HASH_SIZE):
+    """Difference hash of an image (path or PIL image) as a flat bool array of size*size bits."""
+    pixels = load_gray(image, (size + 1, size))
+    return (pixels[:, 1:] > pixels[:, :-1]).ravel()
+
+
+def hash_distance(a, b):
+    """Share of bits (0.0-1.0) that differ between two hashes of the same size."""
+    return float(np.count_nonzero(a != b)) / a.size
+
+
+def load_rgb(image):
+    """(rows, cols, 3) float array of an image at full size."""
+    if not isinstance(image, Image.Image):
+        image = Image.open(image)
+    return np.asarray(image.convert('RGB'), dtype=np.float32)
+
+
+def pixel_rms(a, b):
+    """Root-mean-square difference of two images on the 0-255 scale (ValueError if sizes differ)."""
+    a, b = load_rgb(a), load_rgb(b)
+    if a.shape != b.shape:
+        raise ValueError(f'image sizes differ: {a.shape[1]}x{a.shape[0]} vs {b.shape[1]}x{b.shape[0]}')
+    return float(np.sqrt(np.mean((a - b) ** 2)))
+
+
+def to_hex(bits):
+    return np.packbits(bits).tobytes().hex()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two images by perceptual hash.')
+    parser.add_argument('image')
+    parser.add_argument('other')
+    parser.add_argument('--size', type=int, default=HASH_SIZE)
+    args = parser.parse_args(argv)
+
+    a, b = dhash(args.image, args.size), dhash(args.other, args.size)
+    print(f'{to_hex(a)}\n{to_hex(b)}\n🔍 {hash_distance(a, b):.1%} of bits differ')
+    try:
+        print(f'   pixel RMS {pixel_rms(args.image, args.other):.2f}')
+    except ValueError as error:
+        print(f'   {error}')
+
+
+if __name__ == '__main__':
+    main()
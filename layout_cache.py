@@ -0,0 +1,104 @@
+"""
+Reuse tight_layout() results for figures that have already been laid out.
+
+tight_layout() measures the extent of every title, label and tick label on
+each call, which takes a real share of the render time on large decks. But
+the lesson decks build the same 1x3, 2x2 and 2x3 grids with the same text
+over and over, and identical grids always get identical spacing.
+
+cached_tight_layout(fig) builds a key from what tight_layout depends on:
+- figure size and dpi, and the suptitle
+- each Axes' grid position (rows, cols, span) and whether it is a colorbar
+- the text and font of every title, axis label and tick label
+- the axes limits (they decide how far the edge tick labels overhang), the
+  texts drawn inside the axes and the legend entries
+
+On a hit it re-applies the stored subplot parameters (fig.subplots_adjust);
+on a miss it runs the real tight_layout() and stores the result.
+
+    from layout_cache import cached_tight_layout
+    cached_tight_layout(plt.gcf())    # instead of plt.tight_layout()
+"""
+
+from collections import OrderedDict
+
+MAX_LAYOUTS = 256
+SUBPLOT_PARAMS = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+
+_layouts = OrderedDict()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def _text_key(text):
+    font = text.get_fontproperties()
+    return (text.get_text(), font.get_size_in_points(), font.get_weight(),
+            font.get_family()[0], text.get_rotation())
+
+
+def _tick_key(axis):
+    locs = axis.get_majorticklocs()
+    labels = axis.get_major_formatter().format_ticks(locs) if axis.get_visible() else []
+    return tuple(labels), axis.get_label_position(), axis.get_ticks_position()
+
+
+def _legend_key(ax):
+    legend = ax.get_legend()
+    if legend is None or not legend.get_visible():
+        return None
+    return legend._loc, tuple(_text_key(text) for text in legend.get_texts())
+
+
+def layout_key(fig):
+    """Everything tight_layout() looks at, as a hashable tuple."""
+    axes_keys = []
+    for ax in fig.axes:
+        spec = ax.get_subplotspec()
+        # A colorbar made with plt.colorbar() sits in a grid nested inside its parent's cell
+        grid = None if spec is None else (spec.get_geometry(), spec.get_topmost_subplotspec().get_geometry())
+        axes_keys.append((
+            grid,
+            ax.get_visible(),
+            tuple(ax.get_title(loc) for loc in ('left', 'center', 'right')),
+            _text_key(ax.title),
+            _text_key(ax.xaxis.label),
+            _text_key(ax.yaxis.label),
+            _tick_key(ax.xaxis),
+            _tick_key(ax.yaxis),
+            # The limits decide how far the edge tick labels overhang the axes
+            tuple(ax.get_xlim()),
+            tuple(ax.get_ylim()),
+            tuple((_text_key(text), tuple(text.get_position()), text.get_transform() is ax.transAxes)
+                  for text in ax.texts),
+            _legend_key(ax),
+        ))
+    suptitle = getattr(fig, '_suptitle', None)
+    return (tuple(fig.get_size_inches()), fig.dpi,
+            _text_key(suptitle) if suptitle is not None else None, tuple(axes_keys))
+
+
+def cached_tight_layout(fig, **kwargs):
+    """fig.tight_layout(**kwargs), reusing the result for a layout seen before."""
+    key = (layout_key(fig), tuple(sorted(kwargs.items())))
+    params = _layouts.get(key)
+    if params is not None:
+        _layouts.move_to_end(key)
+        _stats['hits'] += 1
+        fig.subplots_adjust(**params)
+        return False
+
+    _stats['misses'] += 1
+    fig.tight_layout(**kwargs)
+    _layouts[key] = {name: getattr(fig.subplotpars, name) for name in SUBPLOT_PARAMS}
+    if len(_layouts) > MAX_LAYOUTS:
+        _layouts.popitem(last=False)
+    return True
+
+
+def layout_cache_info():
+    """Hits, misses and current size of the layout cache."""
+    return {**_stats, 'size': len(_layouts)}
+
+
+def clear_layout_cache():
+    _layouts.clear()
+    _stats.update(hits=0, misses=0)
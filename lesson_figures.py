@@ -0,0 +1,552 @@
+"""
+The lesson figures as stand-alone recipes.
+
+Every figure that histogram_scatter_explanation.py and matplotlib_explanation.py
+show is rebuilt here as its own function, so each one can be rendered on its
+own (and in its own process) without running the rest of the lesson.
+
+Each figure has:
+- a data function that takes a NumPy Generator and returns the arrays it needs
+- a recipe that draws the figure from those arrays and returns it
+
+build_figure(name, rng) ties the two together. Seed the Generator with
+figure_rng(name) and a figure always gets the same data, no matter which
+order (or which worker) it is rendered in.
+
+The scatter recipes also take density=True, which draws each scatter as a
+density image (see density_scatter.py) for catalogs too large to draw one
+marker per song, and budget=N, which draws only about N of the points while
+keeping the extremes and sparse regions (see downsample.py).
+
+Long-running loops can install a figure_pool.FigurePool with
+use_figure_pool(); new_figure() then reuses cleared figures instead of
+opening a new one per render.
+"""
+
+import inspect
+import zlib
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from density_scatter import color_ramp, density_scatter
+from downsample import thin_indices
+from genre_data import genre_features, genre_sizes
+from histograms import BinCounter, plot_counts
+from layout_cache import cached_tight_layout
+from song_stats import stats_for_arrays
+from variant_grid import HistGeometry, ScatterGeometry, draw_variant_grid
+
+TEST_SCORES = [45, 67, 89, 78, 92, 85, 76, 88, 91, 73, 82, 95, 69, 84, 77,
+               90, 86, 79, 93, 71, 88, 94, 81, 87, 75, 89, 83, 92, 78, 85]
+
+
+def figure_rng(name, base_seed=42):
+    """A Generator seeded from the figure name, so every figure has its own stream."""
+    return np.random.default_rng([base_seed, zlib.crc32(name.encode())])
+
+
+_figure_pool = None
+
+
+def use_figure_pool(pool):
+    """Send new_figure() through a figure_pool.FigurePool (None: plain plt.figure()). Returns pool."""
+    global _figure_pool
+    _figure_pool = pool
+    return pool
+
+
+def new_figure(figsize):
+    """Start a new figure (every recipe goes through here)."""
+    if _figure_pool is not None:
+        return _figure_pool.figure(figsize)
+    return plt.figure(figsize=figsize)
+
+
+def tight_layout():
+    """plt.tight_layout(), reusing the spacing of grids that were laid out before."""
+    cached_tight_layout(plt.gcf())
+
+
+def _thin(x, y, budget, *arrays):
+    """Outlier-preserving subsample of x, y and the per-point arrays (see downsample.py)."""
+    keep, report = thin_indices(x, y, budget, values=list(arrays))
+    plt.text(0.98, 0.02, f"{report['kept']:,} of {report['total']:,} points shown",
+             transform=plt.gca().transAxes, ha='right', va='bottom', fontsize=7, color='dimgray',
+             bbox=dict(facecolor='white', alpha=0.8, edgecolor='none', pad=1))
+    return [np.asarray(a)[keep] for a in (x, y, *arrays)]
+
+
+def _scatter(x, y, density=False, budget=None, **kwargs):
+    """plt.scatter(), or the same points as a density image when density=True.
+
+    With a budget, catalogs larger than it are thinned to about that many points first.
+    """
+    if not density:
+        if budget is not None and len(x) > budget:
+            per_point = {key: kwargs[key] for key in ('c', 's') if np.ndim(kwargs.get(key)) == 1}
+            x, y, *arrays = _thin(x, y, budget, *per_point.values())
+            kwargs.update(zip(per_point, arrays))
+        return plt.scatter(x, y, **kwargs)
+    if kwargs.get('c') is not None:
+        return density_scatter(x, y, values=kwargs['c'], cmap=kwargs.get('cmap', 'viridis'))
+    return density_scatter(x, y, cmap=color_ramp(kwargs.get('color', 'tab:blue')))
+
+
+# ============================================
+# Data for the figures
+# ============================================
+
+def song_popularity_data(rng, n_songs=220):
+    """Many unpopular songs, some popular songs, few mega-hits (PART 2)."""
+    n_unpopular = n_songs * 15 // 22
+    n_popular = n_songs * 5 // 22
+    n_hits = n_songs - n_unpopular - n_popular
+    song_popularity = np.concatenate([
+        rng.normal(30, 10, n_unpopular),
+        rng.normal(75, 8, n_popular),
+        rng.normal(90, 5, n_hits),
+    ])
+    return {'song_popularity': np.clip(song_popularity, 0, 100)}
+
+
+def correlated_song_data(rng, n_songs=100):
+    """Danceability, energy and popularity that are somewhat correlated (PART 3)."""
+    danceability = rng.beta(2, 2, n_songs)
+    energy = np.clip(danceability * 0.7 + rng.normal(0, 0.2, n_songs), 0, 1)
+    popularity = danceability * 30 + energy * 40 + rng.normal(0, 15, n_songs)
+    return {'danceability': danceability, 'energy': energy,
+            'popularity': np.clip(popularity, 0, 100)}
+
+
+def scatter_parameter_data(rng, n_points=80):
+    """X/Y values and random marker sizes for the scatter parameter grid (PART 4)."""
+    x_vals = rng.normal(50, 15, n_points)
+    y_vals = x_vals * 0.8 + rng.normal(0, 10, n_points)
+    sizes = rng.integers(20, 200, n_points)
+    return {'x_vals': x_vals, 'y_vals': y_vals, 'sizes': sizes}
+
+
+def genre_song_data(rng, n_songs=200):
+    """Pop, dance, ballad and rock songs with different characteristics (PART 5)."""
+    # Same 50/40/60/50 split as the lesson, scaled to n_songs (model in genre_data.GENRES)
+    features = [genre_features(rng, genre, size) for genre, size in genre_sizes(n_songs).items()]
+    danceability, energy, popularity = (np.concatenate(column) for column in zip(*features))
+    return {'danceability': danceability, 'energy': energy,
+            'popularity': np.clip(popularity, 0, 100)}
+
+
+def music_lesson_data(rng, n_songs=200):
+    """Independent danceability/energy driving popularity (matplotlib_explanation PART 4)."""
+    danceability = rng.beta(2, 2, n_songs)
+    energy = rng.beta(2, 2, n_songs)
+    popularity = danceability * 40 + energy * 30 + rng.normal(0, 10, n_songs)
+    return {'danceability': danceability, 'energy': energy,
+            'popularity': np.clip(popularity, 0, 100)}
+
+
+# ============================================
+# histogram_scatter_explanation.py
+# ============================================
+
+def part1_test_score_bins(test_scores=TEST_SCORES):
+    """PART 1: the same test scores with 5, 10 and 15 bins."""
+    counter = BinCounter(test_scores)  # sort once, count every bin setting from it
+    fig = new_figure((12, 4))
+    for position, (bins, color) in enumerate([(5, 'skyblue'), (10, 'lightgreen'), (15, 'salmon')], 1):
+        plt.subplot(1, 3, position)
+        plot_counts(*counter.counts(bins), color=color, alpha=0.7, edgecolor='black')
+        plt.title(f'Test Scores Distribution\n({bins} bins)', fontweight='bold')
+        plt.xlabel('Score Range')
+        plt.ylabel('Number of Students')
+        plt.grid(True, alpha=0.3)
+    tight_layout()
+    return fig
+
+
+def part2_hist_parameters(song_popularity):
+    """PART 2: bins, colors, transparency and edges of plt.hist()."""
+    variants = [
+        dict(bins=10, color='blue', alpha=0.6, edgecolor='black', title='bins=10 (default-ish)'),
+        dict(bins=25, color='red', alpha=0.6, edgecolor='black', title='bins=25 (more detail)'),
+        dict(bins=50, color='green', alpha=0.6, edgecolor='black', title='bins=50 (lots of detail)'),
+        dict(bins=20, color='purple', alpha=0.8, edgecolor='white', linewidth=2, title='Purple with white edges'),
+        dict(bins=20, color='orange', alpha=0.5, edgecolor='black', title='Semi-transparent orange'),
+        dict(bins=20, color='gold', alpha=0.9, edgecolor='darkred', linewidth=1.5, title='Gold with dark red edges'),
+    ]
+    fig = new_figure((15, 10))
+    # Bin once per bin setting; each panel only restyles the same bars
+    draw_variant_grid(HistGeometry(song_popularity), variants, 2, 3,
+                      xlabel='Popularity Score', ylabel='Number of Songs')
+    tight_layout()
+    return fig
+
+
+def part3_scatter_relationships(danceability, energy, popularity, density=False, budget=None):
+    """PART 3: three scatter plots showing different relationships."""
+    panels = [
+        (danceability, popularity, 'green', 'Danceability vs Popularity',
+         'Danceability (0=not danceable, 1=very danceable)', 'Popularity Score (0-100)'),
+        (energy, popularity, 'red', 'Energy vs Popularity',
+         'Energy (0=low energy, 1=high energy)', 'Popularity Score (0-100)'),
+        (danceability, energy, 'blue', 'Danceability vs Energy', 'Danceability', 'Energy'),
+    ]
+    fig = new_figure((15, 5))
+    for position, (x, y, color, title, xlabel, ylabel) in enumerate(panels, 1):
+        plt.subplot(1, 3, position)
+        _scatter(x, y, density, budget, alpha=0.7, color=color, s=50)
+        plt.title(title, fontweight='bold')
+        plt.xlabel(xlabel)
+        plt.ylabel(ylabel)
+        plt.grid(True, alpha=0.3)
+    tight_layout()
+    return fig
+
+
+def part4_scatter_parameters(x_vals, y_vals, sizes, budget=None):
+    """PART 4: point size, transparency and color-coding in plt.scatter()."""
+    fig = new_figure((15, 10))
+    if budget is not None and len(x_vals) > budget:
+        keep, report = thin_indices(x_vals, y_vals, budget, values=[sizes])
+        x_vals, y_vals, sizes = x_vals[keep], y_vals[keep], sizes[keep]
+        fig.text(0.99, 0.005, f"{report['kept']:,} of {report['total']:,} points shown",
+                 ha='right', va='bottom', fontsize=7, color='dimgray')
+    variants = [
+        dict(s=20, color='blue', alpha=0.7, title='Small points (s=20)'),
+        dict(s=100, color='red', alpha=0.7, title='Large points (s=100)'),
+        dict(s=sizes, color='green', alpha=0.6, title='Variable point sizes'),
+        dict(s=80, color='purple', alpha=1.0, title='Solid points (alpha=1.0)'),
+        dict(s=80, color='purple', alpha=0.3, title='Transparent (alpha=0.3)'),
+        dict(s=80, c=y_vals, cmap='viridis', alpha=0.8, title='Color-coded by Y value', colorbar='Y value'),
+    ]
+    # Same points in every panel; each panel only gets its own sizes/colors/alpha
+    draw_variant_grid(ScatterGeometry(x_vals, y_vals), variants, 2, 3,
+                      xlabel='X values', ylabel='Y values', grid=True)
+    tight_layout()
+    return fig
+
+
+def _insight_box(text, facecolor, alpha=0.8):
+    plt.text(0.02, 0.98, text, transform=plt.gca().transAxes, verticalalignment='top',
+             bbox=dict(boxstyle='round', facecolor=facecolor, alpha=alpha), fontsize=9)
+
+
+def _pattern_insight(stats, feature):
+    """Insight box text and color for feature vs popularity, from the measured correlations."""
+    r = stats.pearson(feature, 'popularity')
+    rho = stats.spearman(feature, 'popularity')
+    numbers = f'• r = {r:.2f} (Spearman {rho:.2f})'
+    if abs(r) < 0.1:
+        return f'No Clear Pattern:\n• {feature.capitalize()} barely\n  changes popularity\n{numbers}', 'lightcoral'
+    title = 'Pattern Found!' if abs(r) >= 0.5 else 'Moderate Pattern:' if abs(r) >= 0.3 else 'Weak Pattern:'
+    trend = 'more' if r > 0 else 'less'
+    adjective = {'danceability': 'danceable', 'energy': 'energetic'}.get(feature, feature)
+    return (f'{title}\n• More {adjective} songs\n  tend to be {trend} popular\n{numbers}',
+            'lightgreen' if abs(r) >= 0.3 else 'lightcoral')
+
+
+def part5_music_dashboard(danceability, energy, popularity, density=False, budget=None):
+    """PART 5: the 2x3 music dashboard (histograms, scatters and a color-coded view)."""
+    fig = new_figure((15, 10))
+    # The insight boxes quote these numbers instead of hard-coded claims
+    stats = stats_for_arrays({'danceability': danceability, 'energy': energy, 'popularity': popularity})
+    typical = stats.quantiles('popularity', [0.1, 0.9])
+
+    plt.subplot(2, 3, 1)
+    plt.hist(popularity, bins=25, alpha=0.7, color='skyblue', edgecolor='black')
+    plt.title('Song Popularity Distribution\n(What our AI learns from)', fontweight='bold')
+    plt.xlabel('Popularity Score (0-100)')
+    plt.ylabel('Number of Songs')
+    plt.grid(True, alpha=0.3)
+    _insight_box(f'Key Insights:\n• Most songs: {typical[0]:.0f}-{typical[1]:.0f} popularity\n'
+                 f'• Mega-hits (80-100): {stats.fraction_between("popularity", 80):.0%}\n'
+                 f'• Flops (0-20): {stats.fraction_between("popularity", high=20):.0%}',
+                 'yellow')
+
+    plt.subplot(2, 3, 2)
+    _scatter(danceability, popularity, density, budget, alpha=0.6, color='green', s=40)
+    plt.title('Danceability vs Popularity\n(Is there a pattern?)', fontweight='bold')
+    plt.xlabel('Danceability (0=not danceable, 1=very danceable)')
+    plt.ylabel('Popularity Score')
+    plt.grid(True, alpha=0.3)
+    _insight_box(*_pattern_insight(stats, 'danceability'))
+
+    plt.subplot(2, 3, 3)
+    _scatter(energy, popularity, density, budget, alpha=0.6, color='red', s=40)
+    plt.title('Energy vs Popularity\n(Another pattern?)', fontweight='bold')
+    plt.xlabel('Energy (0=low energy, 1=high energy)')
+    plt.ylabel('Popularity Score')
+    plt.grid(True, alpha=0.3)
+    _insight_box(*_pattern_insight(stats, 'energy'))
+
+    plt.subplot(2, 3, 4)
+    plt.hist(danceability, bins=20, alpha=0.7, color='gold', edgecolor='black')
+    plt.title('Danceability Distribution\n(Input feature)', fontweight='bold')
+    plt.xlabel('Danceability Score')
+    plt.ylabel('Number of Songs')
+    plt.grid(True, alpha=0.3)
+
+    plt.subplot(2, 3, 5)
+    plt.hist(energy, bins=20, alpha=0.7, color='orange', edgecolor='black')
+    plt.title('Energy Distribution\n(Another input feature)', fontweight='bold')
+    plt.xlabel('Energy Score')
+    plt.ylabel('Number of Songs')
+    plt.grid(True, alpha=0.3)
+
+    plt.subplot(2, 3, 6)
+    scatter = _scatter(danceability, energy, density, budget, c=popularity, s=50,
+                       cmap='viridis', alpha=0.7, edgecolors='black', linewidth=0.5)
+    plt.colorbar(scatter, label='Popularity Score')
+    plt.title('Danceability vs Energy\n(Color = Popularity)', fontweight='bold')
+    plt.xlabel('Danceability')
+    plt.ylabel('Energy')
+    plt.grid(True, alpha=0.3)
+    _insight_box('Advanced View:\n• Yellow dots = popular\n• Purple dots = unpopular\n• Shows 3 variables at once!',
+                 'white', alpha=0.9)
+
+    tight_layout()
+    return fig
+
+
+# ============================================
+# matplotlib_explanation.py
+# ============================================
+
+def _figsize_demo(figsize, style, title):
+    fig = new_figure(figsize)
+    plt.plot([1, 2, 3, 4], [1, 4, 2, 3], style, linewidth=2, markersize=8)
+    plt.title(title, fontsize=14, fontweight='bold')
+    plt.xlabel('X values')
+    plt.ylabel('Y values')
+    plt.grid(True, alpha=0.3)
+    return fig
+
+
+def part1_figsize_wide():
+    """PART 1: a wide and short 8x3 figure."""
+    return _figsize_demo((8, 3), 'b-o', 'Small Figure: 8x3 inches')
+
+
+def part1_figsize_tall():
+    """PART 1: a tall and narrow 6x8 figure."""
+    return _figsize_demo((6, 8), 'r-s', 'Tall Figure: 6x8 inches')
+
+
+def part2_subplot_row():
+    """PART 2: line, bar and sine plots side by side."""
+    fig = new_figure((15, 4))
+
+    plt.subplot(1, 3, 1)
+    plt.plot([1, 2, 3, 4], [2, 5, 3, 8], 'bo-', linewidth=2, markersize=8)
+    plt.title('Subplot 1 (Left)', fontweight='bold')
+    plt.xlabel('X values')
+    plt.ylabel('Y values')
+    plt.grid(True, alpha=0.3)
+
+    plt.subplot(1, 3, 2)
+    plt.bar(['A', 'B', 'C', 'D'], [3, 7, 2, 5], color=['red', 'green', 'blue', 'orange'])
+    plt.title('Subplot 2 (Middle)', fontweight='bold')
+    plt.xlabel('Categories')
+    plt.ylabel('Values')
+    plt.grid(True, alpha=0.3)
+
+    plt.subplot(1, 3, 3)
+    x = np.linspace(0, 10, 100)
+    plt.plot(x, np.sin(x), 'g-', linewidth=2, label='sin(x)')
+    plt.title('Subplot 3 (Right)', fontweight='bold')
+    plt.xlabel('X values')
+    plt.ylabel('sin(x)')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+
+    tight_layout()
+    return fig
+
+
+def part3_grid_2x2():
+    """PART 3: a 2x2 grid of line plots."""
+    panels = [
+        ([1, 4, 2], 'ro-', 'Top Left (2,2,1)'),
+        ([2, 1, 3], 'go-', 'Top Right (2,2,2)'),
+        ([3, 2, 4], 'bo-', 'Bottom Left (2,2,3)'),
+        ([1, 3, 1], 'mo-', 'Bottom Right (2,2,4)'),
+    ]
+    fig = new_figure((10, 8))
+    for position, (y, style, title) in enumerate(panels, 1):
+        plt.subplot(2, 2, position)
+        plt.plot([1, 2, 3], y, style)
+        plt.title(title)
+        plt.grid(True, alpha=0.3)
+    tight_layout()
+    return fig
+
+
+def part3_stack_3x1():
+    """PART 3: bar, line and histogram stacked vertically."""
+    fig = new_figure((6, 12))
+
+    plt.subplot(3, 1, 1)
+    plt.bar(['Mon', 'Tue', 'Wed'], [20, 35, 30], color='skyblue')
+    plt.title('Top Plot (3,1,1)')
+    plt.ylabel('Temperature')
+
+    plt.subplot(3, 1, 2)
+    plt.plot([1, 2, 3, 4, 5], [10, 15, 13, 17, 20], 'g-o')
+    plt.title('Middle Plot (3,1,2)')
+    plt.ylabel('Sales')
+
+    plt.subplot(3, 1, 3)
+    plt.hist([1, 2, 2, 3, 3, 3, 4, 4, 5], bins=5, color='orange', alpha=0.7)
+    plt.title('Bottom Plot (3,1,3)')
+    plt.xlabel('Values')
+    plt.ylabel('Frequency')
+
+    tight_layout()
+    return fig
+
+
+def part4_music_lesson(danceability, energy, popularity, density=False, budget=None):
+    """PART 4: the 1x3 visualization from the music lesson."""
+    fig = new_figure((12, 4))
+
+    plt.subplot(1, 3, 1)
+    plt.hist(popularity, bins=20, alpha=0.7, color='skyblue')
+    plt.title('Song Popularity Distribution')
+    plt.xlabel('Popularity Score')
+    plt.ylabel('Number of Songs')
+
+    plt.subplot(1, 3, 2)
+    _scatter(danceability, popularity, density, budget, alpha=0.5, color='green')
+    plt.title('Danceability vs Popularity')
+    plt.xlabel('Danceability')
+    plt.ylabel('Popularity')
+
+    plt.subplot(1, 3, 3)
+    _scatter(energy, popularity, density, budget, alpha=0.5, color='red')
+    plt.title('Energy vs Popularity')
+    plt.xlabel('Energy')
+    plt.ylabel('Popularity')
+
+    tight_layout()
+    return fig
+
+
+def part5_subplot_numbering():
+    """PART 5: which position each subplot(2, 3, i) ends up in."""
+    fig = new_figure((12, 6))
+    for i in range(6):
+        plt.subplot(2, 3, i + 1)
+        plt.text(0.5, 0.5, f'subplot(2, 3, {i + 1})\nPosition {i + 1}',
+                 ha='center', va='center', fontsize=12, fontweight='bold',
+                 bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+        plt.xlim(0, 1)
+        plt.ylim(0, 1)
+        plt.xticks([])
+        plt.yticks([])
+    plt.suptitle('Subplot Numbering System (2 rows × 3 columns)', fontsize=16, fontweight='bold')
+    tight_layout()
+    return fig
+
+
+def _tight_layout_demo(suptitle, color, title, xlabel, tight):
+    fig = new_figure((10, 8))
+    fig.suptitle(suptitle, fontsize=14, color=color)
+    for i in range(1, 5):
+        plt.subplot(2, 2, i)
+        plt.plot([1, 2, 3], [1, 4, 2], 'o-')
+        plt.title(f'Plot {i} - {title}')
+        plt.xlabel(xlabel)
+        plt.ylabel('Y axis')
+    if tight:
+        tight_layout()
+    return fig
+
+
+def part6_without_tight_layout():
+    """PART 6: overlapping titles and labels without tight_layout()."""
+    return _tight_layout_demo('WITHOUT tight_layout() - Plots Overlap!', 'red',
+                              'This title might overlap!', 'X axis label that might get cut off', False)
+
+
+def part6_with_tight_layout():
+    """PART 6: the same grid with tight_layout()."""
+    return _tight_layout_demo('WITH tight_layout() - Perfect Spacing!', 'green',
+                              'Clear and readable!', 'X axis label fits perfectly', True)
+
+
+# ============================================
+# Registry: figure name -> (data function, recipe)
+# ============================================
+
+FIGURES = {
+    'part1_test_score_bins': (None, part1_test_score_bins),
+    'part2_hist_parameters': (song_popularity_data, part2_hist_parameters),
+    'part3_scatter_relationships': (correlated_song_data, part3_scatter_relationships),
+    'part4_scatter_parameters': (scatter_parameter_data, part4_scatter_parameters),
+    'part5_music_dashboard': (genre_song_data, part5_music_dashboard),
+    'part1_figsize_wide': (None, part1_figsize_wide),
+    'part1_figsize_tall': (None, part1_figsize_tall),
+    'part2_subplot_row': (None, part2_subplot_row),
+    'part3_grid_2x2': (None, part3_grid_2x2),
+    'part3_stack_3x1': (None, part3_stack_3x1),
+    'part4_music_lesson': (music_lesson_data, part4_music_lesson),
+    'part5_subplot_numbering': (None, part5_subplot_numbering),
+    'part6_without_tight_layout': (None, part6_without_tight_layout),
+    'part6_with_tight_layout': (None, part6_with_tight_layout),
+}
+
+
+def make_data(name, rng, n=None):
+    """Generate the data for one figure (n overrides the lesson's sample size)."""
+    data_fn = FIGURES[name][0]
+    if data_fn is None:
+        return {}
+    return data_fn(rng) if n is None else data_fn(rng, n)
+
+
+# Recipe parameters that the songs table names differently
+COLUMN_ALIASES = {'song_popularity': 'popularity'}
+# Recipe keyword options (see draw_figure), never taken from a frame's columns
+RECIPE_OPTIONS = ('density', 'budget')
+
+
+def frame_data(name, frame):
+    """The arrays one recipe needs, taken from the columns of a DataFrame (or a dict of arrays).
+
+    Columns keep their dtype (float32 stays float32). Parameters with a
+    default are only filled in when the frame has a matching column.
+    """
+    data, missing = {}, []
+    for parameter in inspect.signature(FIGURES[name][1]).parameters.values():
+        if parameter.name in RECIPE_OPTIONS:
+            continue
+        column = next((column for column in (parameter.name, COLUMN_ALIASES.get(parameter.name))
+                       if column is not None and column in frame), None)
+        if column is not None:
+            data[parameter.name] = np.asarray(frame[column])
+        elif parameter.default is inspect.Parameter.empty:
+            missing.append(parameter.name)
+    if missing:
+        raise ValueError(f'{name} needs column(s): {", ".join(missing)}')
+    return data
+
+
+def draw_figure(name, data, **options):
+    """Draw one figure from its data (a dict of arrays, or a DataFrame; see frame_data).
+
+    options (e.g. density=True) are passed on to recipes that accept them and
+    ignored by the rest, so one set of options can be used for every figure.
+    """
+    if hasattr(data, 'columns'):
+        data = frame_data(name, data)
+    _, recipe = FIGURES[name]
+    accepted = inspect.signature(recipe).parameters
+    options = {key: value for key, value in options.items() if key in accepted}
+    return recipe(**data, **options)
+
+
+def build_figure(name, rng=None, n=None, **options):
+    """Generate the data for one figure and draw it."""
+    if rng is None:
+        rng = figure_rng(name)
+    return draw_figure(name, make_data(name, rng, n), **options)
@@ -0,0 +1,225 @@
+"""
+Run selected PARTs of the lesson scripts instead of the whole file.
+
+histogram_scatter_explanation.py (PART 1-8) and matplotlib_explanation.py
+(PART 1-6) do everything at module level, so running either one prints every
+tutorial section and draws every figure. Here each PART is a callable:
+
+    from lesson_parts import part_recipe
+    dashboard = part_recipe('histogram_scatter_explanation.py', 5)
+    figures = dashboard(songs_frame)          # DataFrame or dict of arrays -> [Figure]
+    figures = dashboard()                     # the lesson's own generated data
+
+A PART's recipes are the matching functions in lesson_figures.py. Data is
+taken from the frame's columns (see lesson_figures.frame_data). A recipe
+whose columns are missing draws the lesson's generated data instead. PARTs
+that only print text (e.g. PART 6-8 of histogram_scatter_explanation.py)
+have no recipes.
+
+With --tutorial the CLI runs the PART's original source from the script,
+prints included, after the script's imports. Every PART of both scripts
+runs on its own. The np.random.seed(42) stream then starts at that PART,
+so its random data differs from a full run of the file.
+
+Usage:
+    python lesson_parts.py --list
+    python lesson_parts.py histogram_scatter:5                 # just the music dashboard
+    python lesson_parts.py matplotlib_explanation.py:1,3 histogram_scatter:2-4 --out figures
+    python lesson_parts.py histogram_scatter:5 --data spotify_songs_dataset.csv
+    python lesson_parts.py matplotlib_explanation:4 --tutorial
+"""
+
+import argparse
+import contextlib
+import io
+import re
+import time
+from pathlib import Path
+
+LESSON_DIR = Path(__file__).resolve().parent
+
+# PART -> lesson_figures recipes, per script (in the order the script shows them)
+PARTS = {
+    'histogram_scatter_explanation.py': {
+        1: ['part1_test_score_bins'],
+        2: ['part2_hist_parameters'],
+        3: ['part3_scatter_relationships'],
+        4: ['part4_scatter_parameters'],
+        5: ['part5_music_dashboard'],
+        6: [],
+        7: [],
+        8: [],
+    },
+    'matplotlib_explanation.py': {
+        1: ['part1_figsize_wide', 'part1_figsize_tall'],
+        2: ['part2_subplot_row'],
+        3: ['part3_grid_2x2', 'part3_stack_3x1'],
+        4: ['part4_music_lesson'],
+        5: ['part5_subplot_numbering'],
+        6: ['part6_without_tight_layout', 'part6_with_tight_layout'],
+    },
+}
+
+_PART_HEADER = re.compile(r'^# =+\n(?=# PART (\d+))', flags=re.MULTILINE)
+
+
+def script_name(script):
+    """'histogram_scatter' / 'histogram_scatter_explanation.py' / a path -> the PARTS key."""
+    stem = Path(script).stem
+    matches = [name for name in PARTS if Path(name).stem in (stem, f'{stem}_explanation')]
+    if not matches:
+        raise ValueError(f'Unknown lesson script {script!r} (one of {", ".join(PARTS)})')
+    return matches[0]
+
+
+def parse_selection(text):
+    """'histogram_scatter:2-4,6' -> ('histogram_scatter_explanation.py', [2, 3, 4, 6]); no ':' = every PART."""
+    script, _, parts = text.partition(':')
+    script = script_name(script)
+    if not parts:
+        return script, list(PARTS[script])
+    selected = []
+    for item in parts.split(','):
+        first, _, last = item.partition('-')
+        try:
+            selected += range(int(first), int(last or first) + 1)
+        except ValueError:
+            raise ValueError(f'invalid PART {item!r} in {text!r} (e.g. 5, 1,3 or 2-4)') from None
+    unknown = [part for part in selected if part not in PARTS[script]]
+    if unknown:
+        raise ValueError(f'{script} has no PART {", ".join(map(str, unknown))}')
+    return script, selected
+
+
+def part_recipe(script, part, **options):
+    """A callable for one PART: recipe(data=None, seed=42, n=None) -> list of figures.
+
+    data is a DataFrame or a dict of arrays. Recipes whose columns it lacks
+    (and every recipe, when data is None) draw the lesson's generated data,
+    seeded per figure from seed; the first case is printed. options go to the
+    recipes (density, budget).
+    """
+    import lesson_figures
+    names = PARTS[script_name(script)][part]
+
+    def recipe(data=None, seed=42, n=None):
+        figures = []
+        for name in names:
+            try:
+                arrays = None if data is None else lesson_figures.frame_data(name, data)
+            except ValueError as error:  # the frame doesn't have this recipe's columns
+                print(f'  ⚠️  {error}; drawing the lesson data instead')
+                arrays = None
+            if arrays is None:
+                arrays = lesson_figures.make_data(name, lesson_figures.figure_rng(name, seed), n)
+            figures.append(lesson_figures.draw_figure(name, arrays, **options))
+        return figures
+
+    recipe.__name__ = f'{Path(script_name(script)).stem}_part{part}'
+    recipe.figure_names = names
+    return recipe
+
+
+def part_sources(script):
+    """{0: the script's preamble (imports), 1: source of PART 1, ...}."""
+    path = LESSON_DIR / script_name(script)
+    pieces = _PART_HEADER.split(path.read_text(encoding='utf-8'))
+    sources = {0: pieces[0]}
+    for number, source in zip(pieces[1::2], pieces[2::2]):
+        sources[int(number)] = source
+    return sources
+
+
+def run_tutorial(script, parts, out_dir='figures', fmt='png', dpi=100, quiet=False):
+    """Run the original source of the selected PARTs headlessly; figures go to out_dir."""
+    from headless_render import HeadlessShow, use_headless
+    plt = use_headless()
+    script = script_name(script)
+    sources = part_sources(script)
+    names = [name for part in parts for name in PARTS[script][part]]
+    show = HeadlessShow(plt, names, out_dir, Path(script).stem, fmt=fmt, dpi=dpi)
+
+    code = sources[0] + ''.join(f'# {"=" * 44}\n{sources[part]}' for part in parts)
+    original_show = plt.show
+    plt.show = show
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            exec(compile(code, str(LESSON_DIR / script), 'exec'), {'__name__': '__main__'})
+    finally:
+        plt.show = original_show
+        plt.close('all')
+    return show.records
+
+
+def run_recipes(script, parts, out_dir='figures', fmt='png', dpi=100, data=None, **options):
+    """Draw the recipes of the selected PARTs and save them; one record per figure."""
+    from headless_render import use_headless
+    plt = use_headless()
+    records = []
+    for part in parts:
+        recipe = part_recipe(script, part, **options)
+        if not recipe.figure_names:
+            print(f'  📖 PART {part}: tutorial text only (see --tutorial)')
+            continue
+        start = time.perf_counter()
+        figures = recipe(data)
+        build_s = time.perf_counter() - start
+        for name, fig in zip(recipe.figure_names, figures):
+            path = Path(out_dir) / f'{name}.{fmt}'
+            start = time.perf_counter()
+            fig.savefig(path, dpi=dpi)
+            save_s = time.perf_counter() - start
+            plt.close(fig)
+            records.append({'name': name, 'path': str(path), 'build_s': build_s, 'save_s': save_s})
+            print(f'  🖼️  PART {part}: {path.name:<34} build {build_s:6.3f}s   save {save_s:6.3f}s')
+            build_s = 0.0
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run only the selected PARTs of the lesson scripts.')
+    parser.add_argument('selections', nargs='*', metavar='SCRIPT[:PARTS]',
+                        help='e.g. histogram_scatter:5 or matplotlib_explanation.py:1,3-4 (no PARTS: all)')
+    parser.add_argument('--list', action='store_true', help='list the PARTs and their figures')
+    parser.add_argument('--tutorial', action='store_true', help="run the PARTs' original code, prints included")
+    parser.add_argument('--quiet', action='store_true', help='hide the tutorial prints (with --tutorial)')
+    parser.add_argument('--data', default=None, help='songs CSV to draw the data recipes from')
+    parser.add_argument('--out', default='figures')
+    parser.add_argument('--format', default='png')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--density', action='store_true', help='draw scatter panels as density images')
+    parser.add_argument('--budget', type=int, default=None, help='thin scatter panels to about this many points')
+    args = parser.parse_args(argv)
+
+    if args.list or not args.selections:
+        for script, parts in PARTS.items():
+            print(script)
+            for part, names in parts.items():
+                print(f'  PART {part}: {", ".join(names) or "(text only)"}')
+        return []
+
+    try:
+        selections = [parse_selection(text) for text in args.selections]
+    except ValueError as error:
+        parser.error(str(error))
+    data = None
+    if args.data:
+        from songs_data import load_songs
+        data = load_songs(args.data)
+    Path(args.out).mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    records = []
+    for script, parts in selections:
+        print(f"▶️  {script} PART {', '.join(map(str, parts))}")
+        if args.tutorial:
+            records += run_tutorial(script, parts, args.out, args.format, args.dpi, args.quiet)
+        else:
+            records += run_recipes(script, parts, args.out, args.format, args.dpi, data,
+                                   density=args.density, budget=args.budget)
+    print(f'\n✅ {len(records)} figures written to {args.out}/ in {time.perf_counter() - start:.2f}s')
+    return records
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+"""
+The PART 5 music dashboard as a live monitor of a growing songs CSV.
+
+Re-running the dashboard on every change re-reads the whole file, re-bins
+every song and redraws every marker, so each refresh gets slower as the file
+grows. LiveDashboard does a fixed amount of work per refresh instead, plus
+work proportional to the rows added since the last one:
+
+- CsvTail remembers its byte offset and parses only complete new lines, at
+  most block_bytes per refresh, so a large existing file is caught up over
+  several refreshes instead of being read whole on the first one
+- histogram counts are updated with just the new rows, and only the bar
+  heights are changed (the bars are never rebuilt)
+- new points go into a small "recent" scatter collection (set_offsets), which
+  is drawn on top of a cached background (blitting); the background is then
+  re-captured with those points in it, so old points are never drawn again
+- the insight boxes quote song_stats.StreamingStats, updated with the new rows
+- a full redraw happens only when a histogram outgrows its y-axis (which
+  then grows by half, so this gets rarer) or the window is resized; it draws
+  a bounded reservoir sample (max_points) instead of every song
+
+--simulate appends to the CSV, so it needs a path other than the lesson's
+spotify_songs_dataset.csv.
+
+Usage:
+    python live_dashboard.py                                   # watch spotify_songs_dataset.csv
+    python live_dashboard.py live.csv --simulate 500           # append 500 fake songs per refresh
+    python live_dashboard.py live.csv --simulate 500 --frames 20 --out live_frames   # headless
+"""
+
+import argparse
+import io
+import time
+from pathlib import Path
+
+import numpy as np
+
+from song_stats import StreamingStats
+from songs_data import SONGS_CSV
+
+COLUMNS = ['danceability', 'energy', 'popularity']
+RANGES = {'danceability': (0.0, 1.0), 'energy': (0.0, 1.0), 'popularity': (0.0, 100.0)}
+MAX_POINTS = 50_000
+HEADROOM = 1.5
+BLOCK_BYTES = 8 * 1024 ** 2
+
+
+class CsvTail:
+    """Reads the rows appended to a CSV since the previous read."""
+
+    def __init__(self, csv_path, columns=COLUMNS, block_bytes=BLOCK_BYTES):
+        self.csv_path = Path(csv_path)
+        self.columns = columns
+        self.block_bytes = block_bytes
+        self.offset = 0
+        self.header = None
+
+    def read_new(self):
+        """{column: array} of the complete rows added since the last call, up to about block_bytes.
+
+        Rows beyond the block are left for the next call; the arrays are empty if there are none.
+        """
+        import pandas as pd  # only needed here
+        size = self.csv_path.stat().st_size
+        if size < self.offset:  # truncated or replaced: start over
+            self.offset, self.header = 0, None
+        with open(self.csv_path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(min(size - self.offset, self.block_bytes))
+            while b'\n' not in data and self.offset + len(data) < size:  # a line longer than a block
+                data += f.read(min(size - self.offset - len(data), self.block_bytes))
+        end = data.rfind(b'\n') + 1  # leave a half-written last line for next time
+        data = data[:end]
+        self.offset += end
+        if self.header is None and data:
+            header, _, data = data.partition(b'\n')
+            self.header = header.decode().strip().split(',')
+        if not data.strip():
+            return {column: np.empty(0) for column in self.columns}
+        chunk = pd.read_csv(io.BytesIO(data), header=None, names=self.header, usecols=self.columns)
+        return {column: chunk[column].to_numpy(dtype=float) for column in self.columns}
+
+
+class LiveHistogram:
+    """Fixed-edge bars whose heights follow running counts."""
+
+    def __init__(self, ax, values_range, bins, **style):
+        self.ax = ax
+        self.edges = np.linspace(*values_range, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.bars = ax.bar(self.edges[:-1], self.counts, width=np.diff(self.edges), align='edge',
+                           animated=True, **style)
+        ax.set_ylim(0, 10)
+
+    def add(self, values):
+        """Count new values; True if the y-axis had to grow (needs a full redraw)."""
+        if not len(values):
+            return False
+        changed = np.histogram(values, self.edges)[0]
+        self.counts += changed
+        for bar, count in zip(self.bars, self.counts):
+            bar.set_height(count)
+        top = self.counts.max()
+        if top > self.ax.get_ylim()[1]:
+            self.ax.set_ylim(0, top * HEADROOM)
+            return True
+        return False
+
+
+class Reservoir:
+    """Uniform sample of at most `size` rows of a stream (vectorized Algorithm R)."""
+
+    def __init__(self, size, width, seed=0):
+        self.rows = np.empty((size, width))
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, rows):
+        size = len(self.rows)
+        filled = min(self.seen, size)
+        take = min(size - filled, len(rows))
+        self.rows[filled:filled + take] = rows[:take]
+        rest = rows[take:]
+        if len(rest):
+            # Row number i replaces a random slot with probability size / (i + 1)
+            row_numbers = self.seen + take + np.arange(1, len(rest) + 1)
+            slots = (self.rng.random(len(rest)) * row_numbers).astype(np.int64)
+            keep = slots < size
+            self.rows[slots[keep]] = rest[keep]
+        self.seen += len(rows)
+
+    def sample(self):
+        return self.rows[:min(self.seen, len(self.rows))]
+
+
+class LiveDashboard:
+    """The 2x3 PART 5 dashboard, refreshed incrementally from a growing CSV."""
+
+    def __init__(self, csv_path, max_points=MAX_POINTS):
+        import matplotlib.pyplot as plt
+        self.plt = plt
+        self.tail = CsvTail(csv_path)
+        self.stats = StreamingStats(COLUMNS, RANGES, bins=100)
+        self.reservoir = Reservoir(max_points, len(COLUMNS))
+        self.background = None
+        self.frames = 0
+        self._build()
+
+    def _panel(self, position, title, xlabel, ylabel):
+        ax = self.fig.add_subplot(2, 3, position)
+        ax.set_title(title, fontweight='bold')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.grid(True, alpha=0.3)
+        return ax
+
+    def _insight(self, ax, facecolor):
+        return ax.text(0.02, 0.98, '', transform=ax.transAxes, verticalalignment='top', animated=True,
+                       bbox=dict(boxstyle='round', facecolor=facecolor, alpha=0.8), fontsize=9)
+
+    def _scatter_pair(self, ax, **style):
+        """A background collection (reservoir sample) and a 'recent' one (new points only)."""
+        history = ax.scatter([], [], **style)
+        recent = ax.scatter([], [], animated=True, **style)
+        return history, recent
+
+    def _build(self):
+        self.fig = self.plt.figure(figsize=(15, 10))
+        hist_style = dict(alpha=0.7, edgecolor='black')
+
+        ax = self._panel(1, 'Song Popularity Distribution\n(live)', 'Popularity Score (0-100)', 'Number of Songs')
+        self.popularity_hist = LiveHistogram(ax, RANGES['popularity'], 25, color='skyblue', **hist_style)
+        self.key_text = self._insight(ax, 'yellow')
+
+        ax = self._panel(2, 'Danceability vs Popularity\n(Is there a pattern?)', 'Danceability', 'Popularity Score')
+        ax.set(xlim=(0, 1), ylim=(0, 100))
+        self.dance_points = self._scatter_pair(ax, alpha=0.6, color='green', s=40)
+        self.dance_text = self._insight(ax, 'lightgreen')
+
+        ax = self._panel(3, 'Energy vs Popularity\n(Another pattern?)', 'Energy', 'Popularity Score')
+        ax.set(xlim=(0, 1), ylim=(0, 100))
+        self.energy_points = self._scatter_pair(ax, alpha=0.6, color='red', s=40)
+        self.energy_text = self._insight(ax, 'lightcoral')
+
+        ax = self._panel(4, 'Danceability Distribution\n(Input feature)', 'Danceability Score', 'Number of Songs')
+        self.dance_hist = LiveHistogram(ax, RANGES['danceability'], 20, color='gold', **hist_style)
+
+        ax = self._panel(5, 'Energy Distribution\n(Another input feature)', 'Energy Score', 'Number of Songs')
+        self.energy_hist = LiveHistogram(ax, RANGES['energy'], 20, color='orange', **hist_style)
+
+        ax = self._panel(6, 'Danceability vs Energy\n(Color = Popularity)', 'Danceability', 'Energy')
+        ax.set(xlim=(0, 1), ylim=(0, 1))
+        self.color_points = self._scatter_pair(ax, c=np.empty(0), s=50, cmap='viridis', vmin=0, vmax=100, alpha=0.7,
+                                               edgecolors='black', linewidth=0.5)
+        self.fig.colorbar(self.color_points[0], ax=ax, label='Popularity Score')
+
+        self.fig.tight_layout()
+        self.fig.canvas.mpl_connect('resize_event', lambda event: setattr(self, 'background', None))
+
+    def _set_points(self, collections, rows):
+        """Point each panel's collection at the given (danceability, energy, popularity) rows."""
+        dance, energy, popularity = rows.T
+        self.dance_points[collections].set_offsets(np.column_stack([dance, popularity]))
+        self.energy_points[collections].set_offsets(np.column_stack([energy, popularity]))
+        self.color_points[collections].set_offsets(np.column_stack([dance, energy]))
+        self.color_points[collections].set_array(popularity)
+
+    def _update_text(self):
+        stats = self.stats
+        if stats.n < 3:
+            return
+        low, high = stats.quantiles('popularity', [0.1, 0.9])
+        self.key_text.set_text(f'Songs so far: {stats.n:,}\n• Most songs: {low:.0f}-{high:.0f} popularity\n'
+                               f'• Mega-hits (80-100): {stats.fraction_between("popularity", 80):.0%}')
+        for text, feature in ((self.dance_text, 'danceability'), (self.energy_text, 'energy')):
+            text.set_text(f'Live correlation:\n• r = {stats.pearson(feature, "popularity"):.2f}\n'
+                          f'• Spearman {stats.spearman(feature, "popularity"):.2f}')
+
+    def _animated(self):
+        bars = [bar for hist in (self.popularity_hist, self.dance_hist, self.energy_hist) for bar in hist.bars]
+        return bars + [self.key_text, self.dance_text, self.energy_text]
+
+    def step(self):
+        """Read new rows and refresh. Returns {'rows', 'full_redraw', 'latency_s'}."""
+        start = time.perf_counter()
+        new = self.tail.read_new()
+        rows = np.column_stack([new[column] for column in COLUMNS])
+        rows = rows[np.isfinite(rows).all(axis=1)]
+
+        self.stats.update(rows)
+        grew = [hist.add(rows[:, k]) for hist, k in
+                ((self.popularity_hist, 2), (self.dance_hist, 0), (self.energy_hist, 1))]
+        self.reservoir.add(rows)
+        self._update_text()
+
+        canvas = self.fig.canvas
+        full = self.background is None or any(grew)
+        if full:
+            # Rare: draw everything once (a bounded sample of the history) and cache it
+            self._set_points(0, self.reservoir.sample())
+            self._set_points(1, np.empty((0, 3)))
+            self.fig.tight_layout()  # wider tick labels after the y-axis grew
+            canvas.draw()
+            self.background = canvas.copy_from_bbox(self.fig.bbox)
+        else:
+            # Usual case: only the new points, drawn once onto the cached background
+            canvas.restore_region(self.background)
+            self._set_points(1, rows)
+            for collection in (self.dance_points[1], self.energy_points[1], self.color_points[1]):
+                collection.axes.draw_artist(collection)
+            self.background = canvas.copy_from_bbox(self.fig.bbox)
+
+        for artist in self._animated():
+            artist.axes.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+        self.frames += 1
+        return {'rows': len(rows), 'full_redraw': full, 'latency_s': time.perf_counter() - start}
+
+    def snapshot(self, path):
+        """Save what is on screen now (the blitted buffer, not a fresh draw)."""
+        from matplotlib.image import imsave
+        imsave(path, np.asarray(self.fig.canvas.buffer_rgba()))
+
+
+def append_fake_songs(csv_path, n, rng):
+    """Append n synthetic songs (PART 5 genre model) to a CSV, writing the header if it is new.
+
+    Refuses (ValueError) to write into the lesson's spotify_songs_dataset.csv.
+    """
+    if Path(csv_path).resolve() == SONGS_CSV.resolve():
+        raise ValueError(f'will not append fake songs to the lesson dataset {SONGS_CSV.name}')
+    from genre_data import GENRE_NAMES, genre_features
+    genre = GENRE_NAMES[rng.integers(len(GENRE_NAMES))]
+    dance, energy, popularity = genre_features(rng, genre, n)
+    popularity = np.clip(popularity, 0, 100)
+    csv_path = Path(csv_path)
+    new_file = not csv_path.exists() or csv_path.stat().st_size == 0
+    if not new_file:
+        with open(csv_path, 'rb') as f:
+            f.seek(-1, 2)
+            missing_newline = f.read(1) != b'\n'
+    with open(csv_path, 'a') as f:
+        if new_file:
+            f.write('track_name,artist_name,danceability,energy,loudness,tempo,valence,popularity\n')
+        elif missing_newline:  # the lesson CSV has no newline after its last row
+            f.write('\n')
+        f.writelines(f'Live Track,Live {genre.title()} Band,{d:.3f},{e:.3f},-7.0,120.0,0.5,{p:.1f}\n'
+                     for d, e, p in zip(dance, energy, popularity))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Live PART 5 dashboard over a growing songs CSV.')
+    parser.add_argument('csv_path', nargs='?', default=None,
+                        help='CSV to watch (default: spotify_songs_dataset.csv; required with --simulate)')
+    parser.add_argument('--interval', type=float, default=0.5, help='seconds between refreshes')
+    parser.add_argument('--max-points', type=int, default=MAX_POINTS, help='points kept for full redraws')
+    parser.add_argument('--simulate', type=int, default=0, metavar='N', help='append N fake songs per refresh')
+    parser.add_argument('--frames', type=int, default=None, help='stop after this many refreshes')
+    parser.add_argument('--out', default=None, help='headless: save each frame as a PNG in this directory')
+    args = parser.parse_args(argv)
+    if args.simulate and (args.csv_path is None or Path(args.csv_path).resolve() == SONGS_CSV.resolve()):
+        parser.error('--simulate appends fake songs: give a CSV path other than the lesson dataset')
+    csv_path = args.csv_path or str(SONGS_CSV)
+
+    if args.out:
+        from headless_render import use_headless
+        use_headless()
+        Path(args.out).mkdir(parents=True, exist_ok=True)
+    import matplotlib.pyplot as plt
+
+    rng = np.random.default_rng(0)
+    dashboard = LiveDashboard(csv_path, args.max_points)
+    if not args.out:
+        plt.show(block=False)
+    while args.frames is None or dashboard.frames < args.frames:
+        if args.simulate:
+            append_fake_songs(csv_path, args.simulate, rng)
+        record = dashboard.step()
+        print(f"  {'🔄' if record['full_redraw'] else '⚡'} +{record['rows']:,} songs "
+              f"({dashboard.stats.n:,} total) in {record['latency_s'] * 1000:6.1f} ms", flush=True)
+        if args.out:
+            dashboard.snapshot(Path(args.out) / f'frame{dashboard.frames:04d}.png')
+        else:
+            if not plt.fignum_exists(dashboard.fig.number):
+                break
+            dashboard.fig.canvas.start_event_loop(args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Render the lesson figures in parallel, one figure per worker process.
+
+The figures in lesson_figures.py don't depend on each other, so each one is
+sent to its own process. Every figure draws its data from its own seed
+(figure_rng(name)), which makes the output identical to a serial run
+(--workers 1) no matter how the figures are spread across the workers.
+
+Usage:
+    python parallel_render.py                          # all 14 figures -> figures/
+    python parallel_render.py part5_music_dashboard --format svg
+    python parallel_render.py --workers 1              # serial, for comparison
+    python parallel_render.py --songs 200000 --format svg --max-bytes 2MB
+    python parallel_render.py --cache                  # only re-render figures whose inputs changed
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from headless_render import SAVE_METADATA
+
+
+def render_figure(name, out_dir='figures', fmt='png', dpi=100, base_seed=42, n=None, density=False,
+                  budget=None, max_bytes=None, cache=None):
+    """Build, save and close one figure. Runs inside a worker process.
+
+    With a FigureCache, a figure whose inputs are unchanged is copied from
+    the cache instead of being drawn (see figure_cache.py).
+    """
+    from headless_render import use_headless
+    plt = use_headless()
+    plt.rcParams['svg.hashsalt'] = f'{name}-{base_seed}'  # stable SVG element ids
+    import lesson_figures
+
+    start = time.perf_counter()
+    data = lesson_figures.make_data(name, lesson_figures.figure_rng(name, base_seed), n)
+    path = Path(out_dir) / f'{name}.{fmt}'
+    if cache is not None:
+        from figure_cache import figure_key
+        key = figure_key(name, data, fmt, dpi, max_bytes, density=density, budget=budget)
+        if cache.fetch(key, fmt, path):
+            return {'name': name, 'path': str(path), 'build_s': time.perf_counter() - start,
+                    'save_s': 0.0, 'pid': os.getpid(), 'cached': True}
+    fig = lesson_figures.draw_figure(name, data, density=density, budget=budget)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if max_bytes is not None:
+        # Vector formats: rasterize big collections until the file fits (see vector_export.py)
+        from vector_export import export_figure
+        export_figure(fig, path, fmt, max_bytes=max_bytes, dpi=dpi, bbox_inches=None)
+    else:
+        fig.savefig(path, dpi=dpi, metadata=SAVE_METADATA.get(fmt))
+    save_s = time.perf_counter() - start
+    plt.close(fig)
+    if cache is not None:
+        cache.store(key, fmt, path)
+
+    return {'name': name, 'path': str(path), 'build_s': build_s,
+            'save_s': save_s, 'pid': os.getpid(), 'cached': False}
+
+
+def render_all(names=None, out_dir='figures', fmt='png', dpi=100, workers=None, base_seed=42,
+               n=None, density=False, budget=None, max_bytes=None, cache=None):
+    """Render the given figures (default: all of them) and return one record each."""
+    # Import pyplot (on Agg) and warm the fonts here, so forked workers start warm
+    from fast_start import prepare
+    prepare()
+    from lesson_figures import FIGURES
+    names = list(names or FIGURES)
+    unknown = [name for name in names if name not in FIGURES]
+    if unknown:
+        raise ValueError(f'Unknown figure(s): {", ".join(unknown)}')
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    options = dict(out_dir=out_dir, fmt=fmt, dpi=dpi, base_seed=base_seed, n=n, density=density,
+                   budget=budget, max_bytes=max_bytes, cache=cache)
+
+    if workers == 1:
+        return [render_figure(name, **options) for name in names]
+
+    workers = min(workers or os.cpu_count() or 1, len(names))
+    records = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_figure, name, **options) for name in names]
+        for future in as_completed(futures):
+            record = future.result()
+            records[record['name']] = record
+    return [records[name] for name in names]
+
+
+def main(argv=None):
+    from figure_cache import CACHE_DIR, MAX_BYTES, FigureCache
+    from vector_export import parse_size
+    parser = argparse.ArgumentParser(description='Render lesson figures in parallel worker processes.')
+    parser.add_argument('names', nargs='*', help='figures to render (default: all)')
+    parser.add_argument('--out', default='figures', help='output directory')
+    parser.add_argument('--format', default='png', help='png, svg, pdf, ...')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per core)')
+    parser.add_argument('--seed', type=int, default=42, help='base seed for every figure')
+    parser.add_argument('--songs', type=int, default=None, help='songs per figure (default: lesson size)')
+    parser.add_argument('--density', action='store_true', help='draw scatter panels as density images')
+    parser.add_argument('--budget', type=int, default=None,
+                        help='thin scatter panels to about this many points, keeping the outliers')
+    parser.add_argument('--max-bytes', type=parse_size, default=None,
+                        help='svg/pdf size budget per file, e.g. 2MB (rasterizes big collections)')
+    parser.add_argument('--cache', nargs='?', const=str(CACHE_DIR), default=None, metavar='DIR',
+                        help=f'reuse unchanged figures from a disk cache (default dir: {CACHE_DIR.name})')
+    parser.add_argument('--cache-size', type=parse_size, default=MAX_BYTES, help='cache size cap, e.g. 512MB')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    records = render_all(args.names, args.out, args.format, args.dpi, args.workers, args.seed,
+                         args.songs, args.density, args.budget, args.max_bytes,
+                         FigureCache(args.cache, args.cache_size) if args.cache else None)
+    total = time.perf_counter() - start
+
+    for record in records:
+        print(f"  {'🗄️ ' if record['cached'] else '🖼️ '} {Path(record['path']).name:<34} "
+              f"build {record['build_s']:6.3f}s   save {record['save_s']:6.3f}s   (pid {record['pid']})")
+    busy = sum(record['build_s'] + record['save_s'] for record in records)
+    cached = sum(record['cached'] for record in records)
+    print(f'\n✅ {len(records)} figures written to {args.out}/ in {total:.2f}s '
+          f'({busy:.2f}s of rendering across {len({r["pid"] for r in records})} processes'
+          f'{f", {cached} from cache" if args.cache else ""})')
+    return records
+
+
+if __name__ == '__main__':
+    main()
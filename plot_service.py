@@ -0,0 +1,330 @@
+"""
+Local HTTP service that renders song charts from warm worker processes.
+
+Starting Python, importing numpy/matplotlib and loading the songs for every
+chart costs far more than drawing it. This service pays that once:
+- a pool of worker processes is forked after pyplot is imported, the fonts
+  are warmed and the songs are memory-mapped (fast_start / songs_data)
+- each request is a small plot spec; the PNG of a spec is kept in an LRU
+  cache in memory, and identical specs that arrive together render only once
+- at most --max-concurrent renders run at once; more requests wait briefly
+  and then get 503; an invalid spec gets 400 and a failed render 500, both
+  with a JSON {"error": ...} body
+- every response carries X-Cache (hit/miss) and X-Latency-Ms, and /stats
+  reports p50/p95 latency for hits and misses
+
+Spec fields (JSON body for POST /plot, or query parameters for GET /plot):
+    kind     'hist' or 'scatter'
+    x, y     numeric song columns (y for scatter only)
+    c        optional column to color a scatter by
+    bins     histogram bins (default 20)
+    color, cmap, alpha, title
+    figsize  [width, height] in inches (GET: 8x5), dpi
+    density  draw a scatter as a density image instead of markers
+
+Usage:
+    python plot_service.py --port 8765 --workers 4
+    curl -o hist.png 'http://127.0.0.1:8765/plot?kind=hist&x=popularity&bins=25&color=skyblue'
+    curl -s http://127.0.0.1:8765/stats
+"""
+
+import argparse
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+import numpy as np
+
+from songs_data import NUMERIC_COLUMNS, SONGS_CSV
+
+CACHE_ENTRIES = 256
+MAX_POINTS = 20_000
+QUEUE_TIMEOUT_S = 5.0
+
+_songs = None  # per-worker memory-mapped songs (see _load_songs)
+_counters = {}  # per-worker histograms.BinCounter by column (one sort per column, not per request)
+
+
+def parse_spec(raw):
+    """Validate a plot spec and return it in canonical form (raises ValueError)."""
+    if not isinstance(raw, dict):
+        raise ValueError('a plot spec must be a JSON object')
+    spec = {'kind': raw.get('kind', 'hist')}
+    if spec['kind'] not in ('hist', 'scatter'):
+        raise ValueError("kind must be 'hist' or 'scatter'")
+    axes = ['x', 'y'] if spec['kind'] == 'scatter' else ['x']
+    for axis in axes + (['c'] if raw.get('c') else []):
+        column = raw.get(axis)
+        if column not in NUMERIC_COLUMNS:
+            raise ValueError(f'{axis} must be one of {", ".join(NUMERIC_COLUMNS)}')
+        spec[axis] = column
+
+    figsize = raw.get('figsize', [8, 5])
+    if isinstance(figsize, str):
+        figsize = figsize.lower().split('x')
+    spec['figsize'] = [float(size) for size in figsize]
+    if len(spec['figsize']) != 2 or not all(1 <= size <= 30 for size in spec['figsize']):
+        raise ValueError('figsize must be two sizes between 1 and 30 inches')
+    spec['dpi'] = int(raw.get('dpi', 100))
+    if not 30 <= spec['dpi'] <= 300:
+        raise ValueError('dpi must be between 30 and 300')
+    from matplotlib import colormaps, colors
+    spec['alpha'] = float(raw.get('alpha', 0.7))
+    if not 0 <= spec['alpha'] <= 1:
+        raise ValueError('alpha must be between 0 and 1')
+    spec['color'] = str(raw.get('color', 'skyblue' if spec['kind'] == 'hist' else 'tab:blue'))
+    if not colors.is_color_like(spec['color']):
+        raise ValueError(f"color {spec['color']!r} is not a matplotlib color")
+    spec['cmap'] = str(raw.get('cmap', 'viridis'))
+    if spec['cmap'] not in colormaps:
+        raise ValueError(f"cmap {spec['cmap']!r} is not a matplotlib colormap")
+    spec['title'] = str(raw.get('title', ''))
+    if spec['kind'] == 'hist':
+        spec['bins'] = int(raw.get('bins', 20))
+        if not 1 <= spec['bins'] <= 500:
+            raise ValueError('bins must be between 1 and 500')
+    else:
+        spec['density'] = str(raw.get('density', False)).lower() in ('1', 'true', 'yes')
+    return spec
+
+
+def _load_songs(csv_path=SONGS_CSV):
+    global _songs
+    if _songs is None:
+        from songs_data import load_songs
+        _songs = load_songs(csv_path)
+    return _songs
+
+
+def _warm(csv_path):
+    """Runs once in every worker: pyplot on Agg, fonts warmed, songs mapped."""
+    from fast_start import prepare
+    prepare()
+    _load_songs(csv_path)
+    time.sleep(0.1)  # keep this worker busy so the next warm-up call goes to another one
+    return os.getpid()
+
+
+def render_spec(spec):
+    """Draw one spec and return the PNG bytes. Runs inside a worker process."""
+    from fast_start import prepare
+    plt = prepare()
+    songs = _load_songs()
+
+    fig = plt.figure(figsize=spec['figsize'])
+    try:
+        return _draw_spec(fig, spec, songs)
+    finally:
+        plt.close(fig)  # failed renders too, or the worker leaks figures
+
+
+def _draw_spec(fig, spec, songs):
+    ax = fig.add_subplot()
+    x = np.asarray(songs[spec['x']])
+    if spec['kind'] == 'hist':
+        from histograms import BinCounter, plot_counts
+        if spec['x'] not in _counters:
+            _counters[spec['x']] = BinCounter(x)
+        plot_counts(*_counters[spec['x']].counts(spec['bins']), ax=ax,
+                    color=spec['color'], alpha=spec['alpha'], edgecolor='black')
+        ax.set_ylabel('Number of Songs')
+    else:
+        y = np.asarray(songs[spec['y']])
+        c = np.asarray(songs[spec['c']]) if 'c' in spec else None
+        if spec['density']:
+            from density_scatter import color_ramp, density_scatter
+            artist = density_scatter(x, y, ax=ax, values=c,
+                                     cmap=spec['cmap'] if c is not None else color_ramp(spec['color']))
+        else:
+            if len(x) > MAX_POINTS:
+                from downsample import thin_indices
+                keep, _ = thin_indices(x, y, MAX_POINTS, values=[] if c is None else [c])
+                x, y, c = x[keep], y[keep], None if c is None else c[keep]
+            artist = ax.scatter(x, y, c=c, cmap=spec['cmap'] if c is not None else None,
+                                color=spec['color'] if c is None else None, alpha=spec['alpha'], s=40)
+        if c is not None:
+            fig.colorbar(artist, ax=ax, label=spec['c'])
+        ax.set_ylabel(spec['y'])
+    ax.set_xlabel(spec['x'])
+    ax.set_title(spec['title'], fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=spec['dpi'])
+    return buffer.getvalue()
+
+
+class PlotService:
+    """Warm process pool + LRU cache of rendered specs + concurrency limit + latency log."""
+
+    def __init__(self, workers=None, max_concurrent=None, cache_entries=CACHE_ENTRIES, csv_path=SONGS_CSV):
+        # Import pyplot and map the songs before forking, so every worker starts warm
+        _warm(csv_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        pids = set(self.pool.map(_warm, [csv_path] * self.workers))
+
+        self.slots = threading.BoundedSemaphore(max_concurrent or 2 * self.workers)
+        self.cache = OrderedDict()
+        self.cache_entries = cache_entries
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.latencies = {'hit': deque(maxlen=1000), 'miss': deque(maxlen=1000)}
+        self.rejected = 0
+        print(f'🔥 {len(pids)} warm workers ready')
+
+    def render(self, spec):
+        """PNG bytes of a canonical spec, and whether it came from the cache."""
+        key = json.dumps(spec, sort_keys=True)
+        with self.lock:
+            png = self.cache.get(key)
+            if png is not None:
+                self.cache.move_to_end(key)
+                return png, True
+            future = self.inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self.inflight[key] = Future()
+        if owner:  # wait for a slot without the lock, so cache hits are never held up
+            self._start(key, spec, future)
+        return future.result(), False
+
+    def _start(self, key, spec, future):
+        """Run spec in the pool once a slot is free; its PNG (or error) goes to future."""
+        if not self.slots.acquire(timeout=QUEUE_TIMEOUT_S):
+            with self.lock:
+                self.rejected += 1
+            return self._finish(key, future, error=TimeoutError('too many renders in progress'))
+
+        def done(result):
+            self.slots.release()
+            error = result.exception()
+            self._finish(key, future, None if error else result.result(), error)
+
+        try:
+            self.pool.submit(render_spec, spec).add_done_callback(done)
+        except RuntimeError as error:  # broken or shut-down pool
+            self.slots.release()
+            self._finish(key, future, error=error)
+
+    def _finish(self, key, future, png=None, error=None):
+        with self.lock:
+            if error is None:
+                self.cache[key] = png
+                self.cache.move_to_end(key)
+                while len(self.cache) > self.cache_entries:
+                    self.cache.popitem(last=False)
+            self.inflight.pop(key, None)
+        if error is None:
+            future.set_result(png)
+        else:
+            future.set_exception(error)
+
+    def record(self, cached, latency_s):
+        self.latencies['hit' if cached else 'miss'].append(latency_s * 1000)
+
+    def stats(self):
+        stats = {'workers': self.workers, 'cached_specs': len(self.cache), 'rejected': self.rejected}
+        for kind, values in self.latencies.items():
+            if values:
+                p50, p95 = np.percentile(list(values), [50, 95])
+                stats[kind] = {'count': len(values), 'p50_ms': round(p50, 2), 'p95_ms': round(p95, 2)}
+        return stats
+
+    def close(self):
+        self.pool.shutdown()
+
+
+class PlotHandler(BaseHTTPRequestHandler):
+    service = None  # set by serve()
+
+    def _send(self, status, body, content_type='application/json', headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({'error': message}).encode())
+
+    def _plot(self, raw):
+        start = time.perf_counter()
+        try:
+            spec = parse_spec(raw)
+        except (TypeError, ValueError) as error:
+            return self._error(400, str(error))
+        try:
+            png, cached = self.service.render(spec)
+        except TimeoutError as error:
+            return self._error(503, str(error))
+        except Exception as error:  # raised in the worker (or a broken pool)
+            return self._error(500, f'render failed: {type(error).__name__}: {error}')
+        latency_s = time.perf_counter() - start
+        self.service.record(cached, latency_s)
+        self._send(200, png, 'image/png', [('X-Cache', 'hit' if cached else 'miss'),
+                                           ('X-Latency-Ms', f'{latency_s * 1000:.1f}')])
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/plot':
+            self._plot(dict(parse_qsl(url.query)))
+        elif url.path == '/stats':
+            self._send(200, json.dumps(self.service.stats(), indent=2).encode())
+        elif url.path == '/health':
+            self._send(200, b'{"ok": true}')
+        else:
+            self._error(404, 'try /plot, /stats or /health')
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/plot':
+            return self._error(404, 'POST a JSON spec to /plot')
+        try:
+            raw = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        except json.JSONDecodeError as error:
+            return self._error(400, f'invalid JSON: {error}')
+        self._plot(raw)
+
+    def log_message(self, format, *args):
+        pass  # latency is reported through /stats and the response headers
+
+
+def serve(host='127.0.0.1', port=8765, workers=None, max_concurrent=None, cache_entries=CACHE_ENTRIES,
+          csv_path=SONGS_CSV):
+    service = PlotService(workers, max_concurrent, cache_entries, csv_path)
+    PlotHandler.service = service
+    server = ThreadingHTTPServer((host, port), PlotHandler)
+    print(f'📡 serving song charts on http://{host}:{port}/plot')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        print(json.dumps(service.stats(), indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve song charts from warm matplotlib workers.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per core)')
+    parser.add_argument('--max-concurrent', type=int, default=None, help='renders at once (default: 2 per worker)')
+    parser.add_argument('--cache-entries', type=int, default=CACHE_ENTRIES, help='rendered specs kept in memory')
+    parser.add_argument('--csv', default=str(SONGS_CSV))
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.workers, args.max_concurrent, args.cache_entries, args.csv)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+"""
+Opt-in profiler for the lesson builds: where does the time go?
+
+Wraps the pyplot functions (hist, scatter, colorbar, tight_layout, show, ...),
+the Axes/Figure methods behind them, and the data generators (np.random.*,
+lesson_figures.make_data) so every call is timed and counted per PART. At exit
+it prints a flame-style tree per PART, split into four kinds of work:
+
+    data     generating the arrays (np.random.beta / normal, make_data)
+    artists  creating plot elements (hist, scatter, bar, text, colorbar, ...)
+    layout   tight_layout
+    render   rasterizing and writing (show, savefig, draw)
+
+and can write a Chrome trace (open it in chrome://tracing or ui.perfetto.dev).
+
+PARTs are named after the lesson figures: every plt.show() closes the current
+PART and starts the next one, so the data generation before a figure is
+counted with that figure.
+
+Usage:
+    python pyplot_profiler.py histogram_scatter_explanation.py --trace trace.json
+    python pyplot_profiler.py --figures part5_music_dashboard part2_hist_parameters
+    MATPLOT_PROFILE=1 MATPLOT_PROFILE_TRACE=trace.json python headless_render.py
+"""
+
+import argparse
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+PYPLOT_CALLS = ['figure', 'subplot', 'subplots', 'hist', 'scatter', 'bar', 'plot', 'imshow',
+                'stairs', 'text', 'colorbar', 'title', 'suptitle', 'xlabel', 'ylabel', 'grid',
+                'legend', 'xlim', 'ylim', 'xticks', 'yticks', 'tight_layout', 'savefig', 'show']
+AXES_CALLS = ['hist', 'scatter', 'bar', 'plot', 'imshow', 'stairs', 'text', 'pcolormesh', 'hexbin']
+FIGURE_CALLS = ['savefig', 'draw', 'tight_layout', 'colorbar']
+RANDOM_CALLS = ['normal', 'beta', 'randint', 'uniform', 'random', 'choice']
+
+LAYOUT_CALLS = {'tight_layout'}
+RENDER_CALLS = {'show', 'savefig', 'draw'}
+
+BAR_WIDTH = 30
+
+
+def category(name):
+    """Which kind of work a call is: data, artists, layout or render."""
+    if name.startswith('np.random.') or name == 'make_data':
+        return 'data'
+    if name in LAYOUT_CALLS:
+        return 'layout'
+    if name in RENDER_CALLS:
+        return 'render'
+    return 'artists'
+
+
+class Profiler:
+    """Times wrapped calls, grouped by PART label and call stack."""
+
+    def __init__(self, labels=None):
+        self.labels = list(labels or [])
+        self.events = []          # (label, call path, start_s, duration_s)
+        self.part_wall = defaultdict(float)
+        self._label_index = 0
+        self.label = self._label_for(0)
+        self._label_started = time.perf_counter()
+        self._origin = self._label_started
+        self._stack = []
+        self._patched = []
+
+    def _label_for(self, index):
+        return self.labels[index] if index < len(self.labels) else f'figure{index + 1:02d}'
+
+    def _switch_label(self, label):
+        now = time.perf_counter()
+        self.part_wall[self.label] += now - self._label_started
+        self.label = label
+        self._label_started = now
+
+    def next_part(self):
+        """Close the current PART and start the next one (called on every show())."""
+        self._label_index += 1
+        self._switch_label(self._label_for(self._label_index))
+
+    @contextlib.contextmanager
+    def part(self, label):
+        """Attribute everything inside the block to `label`."""
+        previous = self.label
+        self._switch_label(label)
+        try:
+            yield
+        finally:
+            self._switch_label(previous)
+
+    def call(self, name, func, args, kwargs):
+        # plt.hist -> Axes.hist is one call, not two nested ones
+        if self._stack and self._stack[-1] == name:
+            return func(*args, **kwargs)
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            self.events.append((self.label, tuple(self._stack), start - self._origin, duration))
+            self._stack.pop()
+            if name == 'show' and not self._stack:
+                self.next_part()
+
+    # ----- installing the wrappers -----
+
+    def _wrap(self, owner, attr, name):
+        original = getattr(owner, attr, None)
+        if original is None:
+            return
+        profiler = self
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            return profiler.call(name, original, args, kwargs)
+
+        setattr(owner, attr, wrapper)
+        self._patched.append((owner, attr, original))
+
+    def install(self):
+        import matplotlib.pyplot as plt
+        import numpy as np
+        from matplotlib.axes import Axes
+        from matplotlib.figure import Figure
+
+        for name in PYPLOT_CALLS:
+            self._wrap(plt, name, name)
+        for name in AXES_CALLS:
+            self._wrap(Axes, name, name)
+        for name in FIGURE_CALLS:
+            self._wrap(Figure, name, name)
+        for name in RANDOM_CALLS:
+            self._wrap(np.random, name, f'np.random.{name}')
+
+        import headless_render
+        import lesson_figures
+        self._wrap(lesson_figures, 'make_data', 'make_data')
+        # headless_render swaps plt.show for a HeadlessShow; it may also be running as __main__
+        show_classes = {getattr(sys.modules.get(module), 'HeadlessShow', None)
+                        for module in ('headless_render', '__main__')}
+        for show_class in show_classes - {None}:
+            self._wrap(show_class, '__call__', 'show')
+        return self
+
+    def uninstall(self):
+        for owner, attr, original in reversed(self._patched):
+            setattr(owner, attr, original)
+        self._patched.clear()
+
+    # ----- reporting -----
+
+    def finish(self):
+        self._switch_label(self.label)
+
+    def tree(self):
+        """{label: {call path: [count, total_s]}} in first-seen order."""
+        tree = defaultdict(dict)
+        for label, path, _, duration in self.events:
+            entry = tree[label].setdefault(path, [0, 0.0])
+            entry[0] += 1
+            entry[1] += duration
+        return tree
+
+    def report(self, file=None):
+        """Print the flame-style summary: one block per PART, calls nested under their callers."""
+        file = file or sys.stdout
+        self.finish()
+        tree = self.tree()
+
+        # Order the calls by when they (or their first child) started, so children follow parents
+        first_start = {}
+        for label, path, start, _ in self.events:
+            for depth in range(1, len(path) + 1):
+                key = (label, path[:depth])
+                first_start[key] = min(first_start.get(key, start), start)
+
+        print('\n🔥 pyplot profile (time per PART, nested calls indented)', file=file)
+        print('=' * 78, file=file)
+        for label, calls in tree.items():
+            wall = self.part_wall.get(label, 0.0)
+            kinds = defaultdict(float)
+            for path, (_, total) in calls.items():
+                if len(path) == 1:
+                    kinds[category(path[0])] += total
+            scale = max(wall, sum(kinds.values()), 1e-9)
+            split = '  '.join(f'{kind} {kinds[kind]:.3f}s'
+                              for kind in ('data', 'artists', 'layout', 'render') if kinds[kind])
+            print(f'\n{label}  {wall:.3f}s wall   [{split}]', file=file)
+
+            ordered = sorted(calls, key=lambda path: [first_start[(label, path[:depth])]
+                                                      for depth in range(1, len(path) + 1)])
+            for path in ordered:
+                count, total = calls[path]
+                text = f'{"  " * len(path)}{path[-1]} ×{count}'
+                bar = '█' * max(1, round(BAR_WIDTH * total / scale)) if total >= 0.0005 else ''
+                print(f'{text:<40} {total:8.3f}s  {bar}', file=file)
+            other = wall - sum(kinds.values())
+            if other > 0.0005:
+                print(f'{"  (python / untracked)":<40} {other:8.3f}s', file=file)
+
+    def write_chrome_trace(self, path):
+        """Write the calls as Chrome trace 'complete' events, one row per PART."""
+        self.finish()
+        pid = os.getpid()
+        tid = threading.get_ident()
+        events = [{'name': path_[-1], 'cat': category(path_[-1]), 'ph': 'X',
+                   'ts': start * 1e6, 'dur': duration * 1e6, 'pid': pid, 'tid': tid,
+                   'args': {'part': label, 'stack': ' > '.join(path_)}}
+                  for label, path_, start, duration in self.events]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+
+def enable(labels=None, trace_path=None):
+    """Install a profiler now and print (and optionally write) its report at exit."""
+    profiler = Profiler(labels).install()
+
+    def _report():
+        profiler.report()
+        if trace_path:
+            profiler.write_chrome_trace(trace_path)
+            print(f'\n🧭 Chrome trace written to {trace_path}')
+
+    atexit.register(_report)
+    return profiler
+
+
+def enable_from_env(labels=None):
+    """enable() if MATPLOT_PROFILE is set (MATPLOT_PROFILE_TRACE names the trace file)."""
+    if not os.environ.get('MATPLOT_PROFILE'):
+        return None
+    return enable(labels, os.environ.get('MATPLOT_PROFILE_TRACE'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Profile the pyplot calls of a lesson build.')
+    parser.add_argument('scripts', nargs='*', help='lesson scripts to run headlessly')
+    parser.add_argument('--figures', nargs='+', default=[], help='lesson_figures recipes to build instead')
+    parser.add_argument('--out', default='figures', help='where the figures are written')
+    parser.add_argument('--trace', default=None, help='write a Chrome trace JSON here')
+    args = parser.parse_args(argv)
+
+    from headless_render import FIGURE_NAMES, render_script, use_headless
+    plt = use_headless()
+
+    if args.figures:
+        import lesson_figures
+        profiler = enable(trace_path=args.trace)
+        Path(args.out).mkdir(parents=True, exist_ok=True)
+        for name in args.figures:
+            with profiler.part(name):
+                fig = lesson_figures.build_figure(name)
+                fig.savefig(Path(args.out) / f'{name}.png')
+                plt.close(fig)
+        return
+
+    scripts = args.scripts or list(FIGURE_NAMES)
+    labels = [label for script in scripts for label in FIGURE_NAMES.get(Path(script).name, [])]
+    enable(labels, args.trace)
+    for script in scripts:
+        render_script(script, args.out, quiet=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+Scatter-matrix (pair grid) figures for whole song catalogs.
+
+The lessons plot danceability / energy / popularity pairs one at a time. For a
+new catalog drop we want every numeric column against every other. With
+millions of rows a grid of plt.scatter() panels is hopeless, so:
+- each column's range is found once and its values are turned into bin
+  indices once, as uint8 (NaNs go to an overflow bin that is never drawn)
+- the diagonal histograms come straight from those indices
+- each pair (i < j) is one np.bincount over the two index columns, run in a
+  process pool; panel (j, i) is the transpose of panel (i, j)
+- off-diagonal panels are drawn as density images (or hexbins of the cells),
+  so drawing cost does not depend on the number of rows
+
+    from scatter_matrix import scatter_matrix
+    fig = scatter_matrix(load_songs())
+
+Usage:
+    python scatter_matrix.py [spotify_songs_dataset.csv] --out scatter_matrix.png --workers 4
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from density_scatter import make_norm
+from histograms import plot_counts
+
+BINS = 128
+
+_indices = None  # per-worker copy of the bin indices (see _init_worker)
+
+
+def numeric_columns(data):
+    """The columns of a DataFrame / dict of arrays that hold numbers (not strings or categories)."""
+    return [column for column in data if _is_numeric(data[column])]
+
+
+def _is_numeric(values):
+    return np.asarray(values[:0]).dtype.kind in 'iuf'
+
+
+def column_ranges(data, columns):
+    """{column: (min, max)} over the finite values, padded where a column is constant."""
+    ranges = {}
+    for column in columns:
+        low, high = np.nanmin(data[column]), np.nanmax(data[column])
+        ranges[column] = (float(low) - 0.5, float(high) + 0.5) if low == high else (float(low), float(high))
+    return ranges
+
+
+def bin_indices(values, value_range, bins=BINS):
+    """Bin number (0..bins-1) of each value; NaNs get the overflow bin `bins`."""
+    low, high = value_range
+    scaled = (np.asarray(values, dtype=float) - low) * (bins / (high - low))
+    np.clip(scaled, 0, bins - 1, out=scaled)
+    np.copyto(scaled, bins, where=np.isnan(scaled))
+    return scaled.astype(np.uint8 if bins < 255 else np.uint16)
+
+
+def _init_worker(indices):
+    global _indices
+    _indices = indices
+
+
+def _pair_counts(i, j, bins):
+    """Joint counts of columns i (rows) and j (cols), from the worker's bin indices."""
+    cells = _indices[i].astype(np.intp) * (bins + 1) + _indices[j]
+    counts = np.bincount(cells, minlength=(bins + 1) ** 2).reshape(bins + 1, bins + 1)
+    return counts[:bins, :bins]
+
+
+def pair_counts(data, columns, bins=BINS, ranges=None, workers=None):
+    """Histograms and joint counts for every column pair.
+
+    Returns (hists, grids, ranges): hists[column] are the diagonal counts,
+    grids[(i, j)] for i < j the joint counts with column i along the rows.
+    """
+    ranges = ranges or column_ranges(data, columns)
+    indices = [bin_indices(data[column], ranges[column], bins) for column in columns]
+    hists = {column: np.bincount(index, minlength=bins + 1)[:bins] for column, index in zip(columns, indices)}
+
+    pairs = [(i, j) for i in range(len(columns)) for j in range(i + 1, len(columns))]
+    if workers == 1 or len(pairs) <= 1:
+        _init_worker(indices)
+        grids = [_pair_counts(i, j, bins) for i, j in pairs]
+    else:
+        workers = min(workers or os.cpu_count() or 1, len(pairs))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(indices,)) as pool:
+            grids = list(pool.map(_pair_counts, *zip(*pairs), [bins] * len(pairs)))
+    return hists, dict(zip(pairs, grids)), ranges
+
+
+def _draw_pair(ax, counts, x_range, y_range, kind, norm, cmap):
+    extent = (*x_range, *y_range)
+    if kind == 'hex':
+        # One hexbin point per non-empty cell, weighted by its count
+        rows, cols = np.nonzero(counts)
+        x = x_range[0] + (cols + 0.5) * (x_range[1] - x_range[0]) / counts.shape[1]
+        y = y_range[0] + (rows + 0.5) * (y_range[1] - y_range[0]) / counts.shape[0]
+        hexes = ax.hexbin(x, y, C=counts[rows, cols], reduce_C_function=np.sum,
+                          gridsize=max(counts.shape) // 4, extent=extent, cmap=cmap)
+        hexes.set_norm(make_norm(norm, np.asarray(hexes.get_array())))  # scaled to hex totals, not cells
+        return hexes
+    image = np.ma.masked_where(counts == 0, counts.astype(float))
+    return ax.imshow(image, origin='lower', extent=extent, aspect='auto', interpolation='nearest',
+                     norm=make_norm(norm, counts), cmap=cmap)
+
+
+def scatter_matrix(data, columns=None, bins=BINS, kind='grid', norm='log', cmap='viridis',
+                   color='tab:blue', workers=None, panel_size=2.2):
+    """Draw every column against every other (histograms on the diagonal). Returns the Figure.
+
+    columns default to the numeric ones (numeric_columns); a requested column
+    that is not numeric raises ValueError.
+    kind: 'grid' (density image per panel) or 'hex' (hexbins of the cells)
+    """
+    if kind not in ('grid', 'hex'):
+        raise ValueError(f"kind must be 'grid' or 'hex', not {kind!r}")
+    columns = list(columns or numeric_columns(data))
+    not_numeric = [column for column in columns if not _is_numeric(data[column])]
+    if not_numeric:
+        raise ValueError(f'not numeric, so not in a scatter matrix: {", ".join(not_numeric)}')
+    hists, grids, ranges = pair_counts(data, columns, bins, workers=workers)
+
+    k = len(columns)
+    fig, axes = plt.subplots(k, k, figsize=(panel_size * k, panel_size * k), squeeze=False)
+    for row, y_column in enumerate(columns):
+        for col, x_column in enumerate(columns):
+            ax = axes[row, col]
+            if row == col:
+                low, high = ranges[x_column]
+                plot_counts(hists[x_column], np.linspace(low, high, bins + 1), ax=ax,
+                            histtype='stepfilled', color=color, alpha=0.7)
+                ax.set_xlim(low, high)
+            else:
+                counts = grids[(row, col)] if row < col else grids[(col, row)].T
+                _draw_pair(ax, counts, ranges[x_column], ranges[y_column], kind, norm, cmap)
+            if row == k - 1:
+                ax.set_xlabel(x_column)
+            else:
+                ax.tick_params(labelbottom=False)
+            if col == 0 and row != 0:
+                ax.set_ylabel(y_column)
+            else:
+                ax.tick_params(labelleft=False)  # the diagonal's counts would clash with the y scale
+
+    n = len(data[columns[0]])
+    fig.suptitle(f'Scatter Matrix ({n:,} songs)', fontweight='bold')
+    # tight_layout() would measure k*k axes; a fixed small gap looks the same here
+    fig.subplots_adjust(left=0.08, right=0.98, bottom=0.07, top=0.95, wspace=0.08, hspace=0.08)
+    return fig
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Scatter matrix of the numeric song columns.')
+    parser.add_argument('csv_path', nargs='?', default=None)
+    parser.add_argument('--out', default='scatter_matrix.png')
+    parser.add_argument('--columns', nargs='+', default=None)
+    parser.add_argument('--bins', type=int, default=BINS)
+    parser.add_argument('--kind', choices=['grid', 'hex'], default='grid')
+    parser.add_argument('--norm', choices=['log', 'eq', 'linear'], default='log')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    from headless_render import use_headless
+    from songs_data import NUMERIC_COLUMNS, SONGS_CSV, load_songs
+    use_headless()
+    start = time.perf_counter()
+    songs = load_songs(args.csv_path or SONGS_CSV)
+    fig = scatter_matrix(songs, args.columns or NUMERIC_COLUMNS, args.bins, args.kind,
+                         args.norm, workers=args.workers)
+    fig.savefig(args.out, dpi=args.dpi)
+    print(f'🖼️  {args.out} ({len(songs["popularity"]):,} songs) in {time.perf_counter() - start:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+One-pass, mergeable statistics for the numeric song columns.
+
+The PART 5 dashboard claims "Pattern Found!" and "Weak Pattern" without
+measuring anything. StreamingStats measures it for every column at once:
+- count, mean, variance and the full covariance / Pearson matrix, with
+  Welford-style updates merged by Chan's formula (exact for any chunking)
+- quantiles from fixed-range histograms of each column
+- Spearman for every pair from a joint 2D histogram (ranks of the bins,
+  with ties handled like scipy's midranks)
+
+The moments are exact. Quantiles and Spearman are approximations: the bins
+split each column's min-max range evenly, so every row in a bin counts as
+tied. That is close for the bounded song features, but heavy-tailed columns
+squeeze most rows into a few bins. On a lognormal test column the binned rho
+was 0.375 where the exact value is 0.422. Raise `bins`, or use exact ranks
+for such columns.
+
+Accumulators are small (a few arrays) and merge(), so each worker process can
+summarize its own rows and the parent combines the results.
+
+    stats = StreamingStats(['danceability', 'popularity'], ranges={...})
+    for chunk in chunks:
+        stats.update(chunk)
+    stats.pearson('danceability', 'popularity')
+
+Usage:
+    python song_stats.py [spotify_songs_dataset.csv] --workers 4
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+BINS = 128
+CHUNK_ROWS = 1_000_000
+
+
+def _padded(low, high):
+    """(low, high) as floats, widened by 0.5 on each side when the range is empty."""
+    low, high = float(low), float(high)
+    return (low - 0.5, high + 0.5) if low == high else (low, high)
+
+
+class StreamingStats:
+    """Mergeable count / mean / covariance / histogram accumulator for a set of columns.
+
+    Rows with a NaN in any of the columns are skipped. Values outside a
+    column's range still count for the moments but are clipped into the
+    first/last bin for quantiles and Spearman. An empty range (a constant
+    column) is padded by 0.5 on each side.
+    """
+
+    def __init__(self, columns, ranges, bins=BINS):
+        self.columns = list(columns)
+        self.ranges = {column: _padded(*ranges[column]) for column in self.columns}
+        self.bins = bins
+        k = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))  # sum of (x - mean)(y - mean) over all rows
+        self.hist = np.zeros((k, bins), dtype=np.int64)
+        self.pairs = [(i, j) for i in range(k) for j in range(i + 1, k)]
+        self.joint = np.zeros((len(self.pairs), bins, bins), dtype=np.int64)
+
+    def _bin_index(self, values):
+        low = np.array([self.ranges[column][0] for column in self.columns])
+        high = np.array([self.ranges[column][1] for column in self.columns])
+        index = ((values - low) / (high - low) * self.bins).astype(np.int64)
+        return np.clip(index, 0, self.bins - 1)
+
+    def update(self, data):
+        """Add a chunk: a dict/DataFrame with the columns, or an (n, k) array."""
+        if isinstance(data, np.ndarray) and data.ndim == 2:
+            values = data.astype(float, copy=False)
+        else:
+            values = np.column_stack([np.asarray(data[column], dtype=float) for column in self.columns])
+        values = values[np.isfinite(values).all(axis=1)]
+        if not len(values):
+            return self
+
+        chunk = StreamingStats(self.columns, self.ranges, self.bins)
+        chunk.n = len(values)
+        chunk.mean = values.mean(axis=0)
+        centered = values - chunk.mean
+        chunk.comoment = centered.T @ centered
+
+        index = self._bin_index(values)
+        for column in range(len(self.columns)):
+            chunk.hist[column] = np.bincount(index[:, column], minlength=self.bins)
+        for pair, (i, j) in enumerate(self.pairs):
+            flat = index[:, i] * self.bins + index[:, j]
+            chunk.joint[pair] = np.bincount(flat, minlength=self.bins * self.bins).reshape(self.bins, self.bins)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Fold another accumulator over the same columns, ranges and bins into this one."""
+        if (other.columns, other.ranges, other.bins) != (self.columns, self.ranges, self.bins):
+            raise ValueError('Can only merge StreamingStats with the same columns, ranges and bins')
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.comoment += other.comoment + np.outer(delta, delta) * (self.n * other.n / n)
+        self.mean = self.mean + delta * (other.n / n)
+        self.n = n
+        self.hist += other.hist
+        self.joint += other.joint
+        return self
+
+    # ---- results ----
+
+    def _index(self, column):
+        return self.columns.index(column)
+
+    def variance(self, ddof=1):
+        """Per-column variance (sample variance by default, like pandas)."""
+        return np.diag(self.comoment) / (self.n - ddof)
+
+    def covariance(self, ddof=1):
+        return self.comoment / (self.n - ddof)
+
+    def pearson_matrix(self):
+        std = np.sqrt(np.diag(self.comoment))
+        return self.comoment / np.outer(std, std)
+
+    def pearson(self, x, y):
+        return float(self.pearson_matrix()[self._index(x), self._index(y)])
+
+    def _midranks(self, counts):
+        return np.cumsum(counts) - counts + (counts + 1) / 2
+
+    def spearman(self, x, y):
+        """Approximate Spearman's rho from the joint histogram (rows in the same bin share a rank)."""
+        i, j = self._index(x), self._index(y)
+        if i == j:
+            return 1.0
+        joint = self.joint[self.pairs.index((min(i, j), max(i, j)))]
+        if i > j:
+            joint = joint.T
+        rank_x = self._midranks(joint.sum(axis=1)) - (self.n + 1) / 2
+        rank_y = self._midranks(joint.sum(axis=0)) - (self.n + 1) / 2
+        covariance = rank_x @ joint @ rank_y
+        spread_x = joint.sum(axis=1) @ rank_x ** 2
+        spread_y = joint.sum(axis=0) @ rank_y ** 2
+        with np.errstate(invalid='ignore'):  # a constant column has no rank spread: NaN, like pandas
+            return float(covariance / np.sqrt(spread_x * spread_y))
+
+    def spearman_matrix(self):
+        k = len(self.columns)
+        return np.array([[self.spearman(self.columns[i], self.columns[j]) for j in range(k)]
+                         for i in range(k)])
+
+    def quantiles(self, column, q):
+        """Approximate quantiles of a column (linear within a bin, like np.quantile on the bins)."""
+        low, high = self.ranges[column]
+        edges = np.linspace(low, high, self.bins + 1)
+        cumulative = np.concatenate([[0], np.cumsum(self.hist[self._index(column)])])
+        return np.interp(np.asarray(q) * self.n, cumulative, edges)
+
+    def fraction_between(self, column, low=-np.inf, high=np.inf):
+        """Share of rows with low <= value < high (to the bin width)."""
+        range_low, range_high = self.ranges[column]
+        edges = np.linspace(range_low, range_high, self.bins + 1)
+        cumulative = np.concatenate([[0], np.cumsum(self.hist[self._index(column)])])
+        below = np.interp([low, high], edges, cumulative)
+        return float((below[1] - below[0]) / self.n)
+
+    def summary(self):
+        """{column: {count, mean, std, p05, p25, p50, p75, p95}}"""
+        std = np.sqrt(self.variance())
+        summary = {}
+        for k, column in enumerate(self.columns):
+            p05, p25, p50, p75, p95 = self.quantiles(column, [0.05, 0.25, 0.5, 0.75, 0.95])
+            summary[column] = {'count': self.n, 'mean': float(self.mean[k]), 'std': float(std[k]),
+                               'p05': p05, 'p25': p25, 'p50': p50, 'p75': p75, 'p95': p95}
+        return summary
+
+
+def data_ranges(data, columns):
+    """(min, max) of each column, ignoring NaNs, padded where a column is constant."""
+    return {column: _padded(np.nanmin(data[column]), np.nanmax(data[column])) for column in columns}
+
+
+def stats_for_arrays(data, columns=None, ranges=None, bins=BINS, chunk_rows=CHUNK_ROWS):
+    """StreamingStats of in-memory (or memory-mapped) columns, chunk by chunk."""
+    columns = list(columns or data)
+    ranges = ranges or data_ranges(data, columns)
+    stats = StreamingStats(columns, ranges, bins)
+    rows = len(data[columns[0]])
+    for start in range(0, rows, chunk_rows):
+        stats.update({column: data[column][start:start + chunk_rows] for column in columns})
+    return stats
+
+
+def stats_for_csv(csv_path, columns, ranges, bins=BINS, chunksize=CHUNK_ROWS):
+    """StreamingStats of a CSV read in chunks (ranges must be known up front)."""
+    import pandas as pd  # only needed here
+    stats = StreamingStats(columns, ranges, bins)
+    for chunk in pd.read_csv(csv_path, usecols=columns, chunksize=chunksize):
+        stats.update(chunk)
+    return stats
+
+
+def _stats_for_rows(csv_path, columns, ranges, bins, start, stop):
+    """Worker: accumulate rows [start, stop) of the cached songs columns."""
+    from songs_data import load_songs
+    songs = load_songs(csv_path)
+    return stats_for_arrays({column: songs[column][start:stop] for column in columns},
+                            columns, ranges, bins)
+
+
+def song_stats(csv_path=None, columns=None, bins=BINS, chunk_rows=CHUNK_ROWS, workers=None):
+    """StreamingStats of the songs dataset, rows split over worker processes.
+
+    Reads through the binary column cache (songs_data.load_songs), so every
+    worker memory-maps the same files; the partial results are merged in order.
+    """
+    from songs_data import NUMERIC_COLUMNS, SONGS_CSV, load_songs
+    csv_path = csv_path or SONGS_CSV
+    columns = list(columns or NUMERIC_COLUMNS)
+    songs = load_songs(csv_path)
+    ranges = data_ranges(songs, columns)
+    rows = len(songs[columns[0]])
+    starts = list(range(0, rows, chunk_rows))
+    if workers == 1 or len(starts) <= 1:
+        return stats_for_arrays(songs, columns, ranges, bins, chunk_rows)
+
+    stats = StreamingStats(columns, ranges, bins)
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(starts))) as pool:
+        for part in pool.map(_stats_for_rows, [csv_path] * len(starts), [columns] * len(starts),
+                             [ranges] * len(starts), [bins] * len(starts),
+                             starts, [start + chunk_rows for start in starts]):
+            stats.merge(part)
+    return stats
+
+
+def print_report(stats):
+    print(f'{"column":<14}{"mean":>10}{"std":>10}{"p05":>10}{"p50":>10}{"p95":>10}')
+    for column, row in stats.summary().items():
+        print(f'{column:<14}{row["mean"]:10.3f}{row["std"]:10.3f}'
+              f'{row["p05"]:10.3f}{row["p50"]:10.3f}{row["p95"]:10.3f}')
+
+    print(f'\n{"pair":<28}{"pearson":>10}{"spearman":>10}')
+    for i, j in stats.pairs:
+        x, y = stats.columns[i], stats.columns[j]
+        print(f'{x + " / " + y:<28}{stats.pearson(x, y):10.3f}{stats.spearman(x, y):10.3f}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Means, quantiles and correlations of the songs dataset.')
+    parser.add_argument('csv_path', nargs='?', default=None)
+    parser.add_argument('--bins', type=int, default=BINS)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    stats = song_stats(args.csv_path, bins=args.bins, chunk_rows=args.chunk_rows, workers=args.workers)
+    print(f'📊 {stats.n:,} songs summarized in {time.perf_counter() - start:.2f}s\n')
+    print_report(stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+"""
+Fast loading of spotify_songs_dataset.csv through a binary column cache.
+
+Every lesson script and notebook re-parses the songs CSV as text. The first
+load_songs() call writes a sidecar directory next to the CSV
+(spotify_songs_dataset.csv.cache/) with:
+- one .npy file per numeric column
+- track_name / artist_name dictionary-encoded: int32 codes + the distinct strings
+- meta.json with the size, mtime (and optionally SHA-256) of the CSV
+
+Later calls just memory-map the .npy files, which costs next to nothing no
+matter how big the export is. If the CSV changes (size/mtime, or its hash with
+verify='hash') the cache rebuilds itself.
+
+    from songs_data import load_songs
+    songs = load_songs()
+    plt.hist(songs['popularity'], bins=20)
+
+load_songs_compact() reads the CSV into a DataFrame typed by SONG_SCHEMA
+instead of pandas' defaults (float64 numbers, one Python str per name):
+- float32 for the audio features
+- the smallest integer type for popularity and tempo when every value is a
+  whole number (float32 otherwise)
+- Categoricals for track and artist names
+The frame goes straight into the recipes (lesson_figures.draw_figure(name,
+frame)) and keeps its dtypes there. memory_report() compares it with what
+the pandas defaults would take.
+
+Usage:
+    python songs_data.py [spotify_songs_dataset.csv] [--rebuild] [--verify hash]
+    python songs_data.py --compact [--measure]     # typed load + memory report
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+LESSON_DIR = Path(__file__).resolve().parent
+SONGS_CSV = LESSON_DIR / 'spotify_songs_dataset.csv'
+
+NUMERIC_COLUMNS = ['danceability', 'energy', 'loudness', 'tempo', 'valence', 'popularity']
+STRING_COLUMNS = ['track_name', 'artist_name']
+
+CACHE_VERSION = 1
+CHUNK_ROWS = 1_000_000
+
+# Column types for load_songs_compact(): 'integer' = smallest int type if every
+# value is a whole number, else float32
+SONG_SCHEMA = {
+    'track_name': 'category',
+    'artist_name': 'category',
+    'danceability': 'float32',
+    'energy': 'float32',
+    'loudness': 'float32',
+    'tempo': 'integer',
+    'valence': 'float32',
+    'popularity': 'integer',
+}
+
+
+def cache_dir_for(csv_path):
+    """Where the binary cache of a CSV lives (a sidecar directory next to it)."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + '.cache')
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_info(csv_path, with_hash):
+    stat = os.stat(csv_path)
+    info = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if with_hash:
+        info['sha256'] = file_sha256(csv_path)
+    return info
+
+
+def _read_meta(cache_dir):
+    try:
+        with open(cache_dir / 'meta.json') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_is_fresh(csv_path, meta, verify):
+    if meta is None or meta.get('version') != CACHE_VERSION:
+        return False
+    stat = os.stat(csv_path)
+    source = meta['source']
+    if source['size'] == stat.st_size and source['mtime_ns'] == stat.st_mtime_ns:
+        return verify != 'hash' or source.get('sha256') == file_sha256(csv_path)
+    # Touched but not changed: with a hash we can tell, and keep the cache
+    return verify == 'hash' and source.get('sha256') == file_sha256(csv_path)
+
+
+def _raw_to_npy(raw_path, npy_path, dtype, rows):
+    """Wrap a raw binary column file in a .npy header (streamed, bounded memory)."""
+    header = {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+              'fortran_order': False, 'shape': (rows,)}
+    with open(npy_path, 'wb') as out, open(raw_path, 'rb') as raw:
+        np.lib.format.write_array_header_1_0(out, header)
+        shutil.copyfileobj(raw, out, 1 << 20)
+    os.remove(raw_path)
+
+
+def build_cache(csv_path=SONGS_CSV, verify='mtime', chunksize=CHUNK_ROWS):
+    """(Re)build the binary cache of a songs CSV, reading it one chunk at a time."""
+    csv_path = Path(csv_path)
+    cache_dir = cache_dir_for(csv_path)
+    building = cache_dir.with_name(cache_dir.name + '.building')
+    shutil.rmtree(building, ignore_errors=True)
+    building.mkdir(parents=True)
+
+    source = _source_info(csv_path, with_hash=verify == 'hash')
+    raw_files = {column: open(building / f'{column}.raw', 'wb')
+                 for column in NUMERIC_COLUMNS + STRING_COLUMNS}
+    lookups = {column: {} for column in STRING_COLUMNS}
+    rows = 0
+    try:
+        for chunk in pd.read_csv(csv_path, usecols=NUMERIC_COLUMNS + STRING_COLUMNS,
+                                 dtype={column: str for column in STRING_COLUMNS},
+                                 chunksize=chunksize):
+            for column in NUMERIC_COLUMNS:
+                raw_files[column].write(chunk[column].to_numpy(dtype=np.float64).tobytes())
+            for column in STRING_COLUMNS:
+                # Factorize the chunk, then map its distinct strings onto the global codes
+                codes, uniques = pd.factorize(chunk[column])
+                lookup = lookups[column]
+                global_codes = np.array([lookup.setdefault(value, len(lookup)) for value in uniques] + [-1],
+                                        dtype=np.int32)
+                raw_files[column].write(global_codes[codes].tobytes())  # -1 (missing) stays -1
+            rows += len(chunk)
+    finally:
+        for f in raw_files.values():
+            f.close()
+
+    for column in NUMERIC_COLUMNS:
+        _raw_to_npy(building / f'{column}.raw', building / f'{column}.npy', np.float64, rows)
+    for column in STRING_COLUMNS:
+        _raw_to_npy(building / f'{column}.raw', building / f'{column}.codes.npy', np.int32, rows)
+        np.save(building / f'{column}.categories.npy', np.array(list(lookups[column]), dtype=str))
+
+    meta = {'version': CACHE_VERSION, 'source': source, 'rows': rows,
+            'numeric': NUMERIC_COLUMNS, 'strings': STRING_COLUMNS}
+    with open(building / 'meta.json', 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    # Swap the finished cache in only once it is complete
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(building, cache_dir)
+    return cache_dir
+
+
+def load_songs(csv_path=SONGS_CSV, verify='mtime', rebuild=False):
+    """Load the songs dataset as a dict of columns, through the binary cache.
+
+    Numeric columns are read-only memory-mapped float64 arrays; track_name and
+    artist_name are pandas Categoricals (int32 codes + distinct strings).
+    verify='mtime' trusts the CSV's size and mtime; verify='hash' also
+    compares its SHA-256 (slower, but survives copies that reset mtime).
+    """
+    csv_path = Path(csv_path)
+    cache_dir = cache_dir_for(csv_path)
+    meta = _read_meta(cache_dir)
+    if rebuild or not _cache_is_fresh(csv_path, meta, verify):
+        build_cache(csv_path, verify)
+        meta = _read_meta(cache_dir)
+    elif verify == 'hash' and meta['source']['mtime_ns'] != os.stat(csv_path).st_mtime_ns:
+        # Same content, new mtime: remember it so the next check is cheap again
+        meta['source'] = _source_info(csv_path, with_hash=True)
+        with open(cache_dir / 'meta.json', 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    songs = {}
+    for column in meta['strings']:
+        codes = np.load(cache_dir / f'{column}.codes.npy', mmap_mode='r')
+        categories = np.load(cache_dir / f'{column}.categories.npy')
+        songs[column] = pd.Categorical.from_codes(codes, categories, validate=False)
+    for column in meta['numeric']:
+        songs[column] = np.load(cache_dir / f'{column}.npy', mmap_mode='r')
+    return songs
+
+
+def load_songs_frame(csv_path=SONGS_CSV, verify='mtime'):
+    """The same columns as a DataFrame, in the CSV's column order (copies the data)."""
+    songs = load_songs(csv_path, verify)
+    return pd.DataFrame({column: songs[column] for column in STRING_COLUMNS + NUMERIC_COLUMNS})
+
+
+def _smallest_int(low, high):
+    """Smallest NumPy integer type that holds every value in [low, high]."""
+    return np.result_type(np.min_scalar_type(int(low)), np.min_scalar_type(int(high)))
+
+
+def load_songs_compact(csv_path=SONGS_CSV, schema=SONG_SCHEMA, chunksize=CHUNK_ROWS):
+    """The songs as a DataFrame with the compact column types of `schema`, read chunk by chunk."""
+    from pandas.api.types import union_categoricals
+    read_types = {'category': str, 'float32': np.float32, 'integer': np.float64}
+    pieces = {column: [] for column in schema}
+    whole = {column: True for column, kind in schema.items() if kind == 'integer'}
+    for chunk in pd.read_csv(csv_path, usecols=list(schema),
+                             dtype={column: read_types[kind] for column, kind in schema.items()},
+                             chunksize=chunksize):
+        for column, kind in schema.items():
+            if kind == 'category':
+                pieces[column].append(chunk[column].astype('category'))
+                continue
+            values = chunk[column].to_numpy()
+            if kind == 'integer':
+                whole[column] = whole[column] and bool(np.all(values == np.round(values)))  # NaN fails
+                values = values.astype(np.float32)
+            pieces[column].append(values)
+
+    columns = {}
+    for column, kind in schema.items():
+        if kind == 'category':
+            columns[column] = union_categoricals(pieces[column])
+            continue
+        values = np.concatenate(pieces[column])
+        pieces[column] = None
+        # float32 holds whole numbers exactly up to 2**24
+        if kind == 'integer' and whole[column] and len(values) and np.abs(values).max() < 2 ** 24:
+            values = values.astype(_smallest_int(values.min(), values.max()))
+        columns[column] = values
+    return pd.DataFrame(columns)
+
+
+def default_memory(frame):
+    """{column: bytes} the same table takes when read with pandas defaults.
+
+    Numbers are float64. Strings are object columns with one Python str per row,
+    counted the way memory_usage(deep=True) counts them. Missing names are NaN
+    floats.
+    """
+    memory = {}
+    for column in frame:
+        values = frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            sizes = np.array([sys.getsizeof(category) for category in values.cat.categories], dtype=np.int64)
+            codes = values.cat.codes.to_numpy()
+            used = np.bincount(codes[codes >= 0], minlength=len(sizes))
+            memory[column] = 8 * len(values) + int(used @ sizes) + int((codes < 0).sum()) * sys.getsizeof(0.0)
+        else:
+            memory[column] = 8 * len(values)
+    return memory
+
+
+def memory_report(frame, measured=None):
+    """Lines comparing the pandas-default footprint (estimated, or measured) with the compact frame."""
+    before = measured if measured is not None else default_memory(frame)
+    after = frame.memory_usage(index=False, deep=True)
+    lines = [f"  {'column':<14} {'defaults':>12} {'compact':>12}  dtype"]
+    for column in frame:
+        lines.append(f'  {column:<14} {before[column] / 1024 ** 2:9.2f} MB {after[column] / 1024 ** 2:9.2f} MB  '
+                     f'{frame[column].dtype}')
+    total_before, total_after = sum(before[column] for column in frame), after.sum()
+    lines.append(f"  {'total':<14} {total_before / 1024 ** 2:9.2f} MB {total_after / 1024 ** 2:9.2f} MB  "
+                 f'({total_before / max(total_after, 1):.1f}x smaller)')
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or check the binary cache of the songs CSV.')
+    parser.add_argument('csv_path', nargs='?', default=str(SONGS_CSV))
+    parser.add_argument('--rebuild', action='store_true', help='rebuild even if the cache is fresh')
+    parser.add_argument('--verify', choices=['mtime', 'hash'], default='mtime')
+    parser.add_argument('--compact', action='store_true', help='typed load (SONG_SCHEMA) with a memory report')
+    parser.add_argument('--measure', action='store_true',
+                        help='with --compact: also load with pandas defaults to measure the "before" size')
+    args = parser.parse_args(argv)
+
+    if args.compact:
+        start = time.perf_counter()
+        frame = load_songs_compact(args.csv_path)
+        elapsed = time.perf_counter() - start
+        measured = None
+        if args.measure:
+            measured = pd.read_csv(args.csv_path, usecols=list(SONG_SCHEMA)).memory_usage(index=False, deep=True)
+        print(f'🎵 {len(frame):,} songs loaded compact in {elapsed:.2f}s '
+              f'(before: {"measured" if args.measure else "estimated"} pandas defaults)')
+        print('\n'.join(memory_report(frame, measured)))
+        return
+
+    start = time.perf_counter()
+    songs = load_songs(args.csv_path, args.verify, args.rebuild)
+    elapsed = time.perf_counter() - start
+    rows = len(songs['popularity'])
+    print(f'🎵 {rows:,} songs loaded in {elapsed * 1000:.1f} ms '
+          f'(cache: {cache_dir_for(args.csv_path)})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Vectorized version of create_student_dataset() from the homework and handout.
+
+The handout version loops over the students one at a time in Python, which is
+fine for a class of 150 but becomes the bottleneck for district-scale cohorts.
+This one draws every column for a whole batch of students at once and keeps
+the same structure:
+- early-bird / normal / late-riser tiers (30 / 80 / 40 out of every 150)
+- study hours and base score depend on the wake-up time
+- test scores driven by study hours, screen time inversely related to them
+
+iter_student_chunks() yields fixed-size DataFrames so millions of students can
+be produced (or written to CSV) in bounded memory.
+
+Usage:
+    python student_data.py 10000000 --chunk-size 1000000 --out students.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# (mean wake-up hour, std, share of the class) for each tier
+WAKE_UP_TIERS = [
+    (6.5, 0.5, 30),   # Early birds (6-7 AM)
+    (7.2, 0.7, 80),   # Normal students (6:30-8 AM)
+    (8.5, 1.0, 40),   # Late risers (7:30-10 AM)
+]
+
+# Study hours (mean, std) and base score, chosen by wake-up time:
+# before 7 AM, before 8 AM, 8 AM or later
+STUDY_MEAN = np.array([2.5, 1.8, 1.2])
+STUDY_STD = np.array([0.8, 0.6, 0.5])
+BASE_SCORE = np.array([82, 78, 72])
+
+
+def _tier_sizes(n_students):
+    """Split n_students into early/normal/late tiers in the 30/80/40 ratio."""
+    class_size = sum(share for _, _, share in WAKE_UP_TIERS)
+    early = n_students * WAKE_UP_TIERS[0][2] // class_size
+    late = n_students * WAKE_UP_TIERS[2][2] // class_size
+    return [early, n_students - early - late, late]
+
+
+def _student_chunk(rng, n_students, first_id=1):
+    # Wake up times (in hours after midnight), one block per tier
+    wake_up_times = np.concatenate([
+        rng.normal(mean, std, size)
+        for (mean, std, _), size in zip(WAKE_UP_TIERS, _tier_sizes(n_students))
+    ])
+    wake_up_times = np.clip(wake_up_times, 5.5, 10.5)  # 5:30 AM to 10:30 AM
+
+    # 0 = early bird (< 7), 1 = normal (< 8), 2 = late riser
+    tier = np.searchsorted([7, 8], wake_up_times, side='right')
+
+    study_hours = np.maximum(0.5, rng.normal(STUDY_MEAN[tier], STUDY_STD[tier]))  # At least 30 minutes
+    test_scores = np.clip(BASE_SCORE[tier] + study_hours * 6 + rng.normal(0, 8, n_students), 45, 98)
+    screen_time = np.clip(8 - study_hours + rng.normal(0, 1.5, n_students), 2, 12)  # 2-12 hours per day
+
+    return pd.DataFrame({
+        'student_id': np.arange(first_id, first_id + n_students),
+        'wake_up_time': wake_up_times,
+        'study_hours': study_hours,
+        'test_score': test_scores,
+        'screen_time_hours': screen_time,
+    })
+
+
+def iter_student_chunks(n_students, chunk_size=1_000_000, seed=42):
+    """Yield DataFrames of at most chunk_size students until n_students are made.
+
+    Each chunk gets its own child seed (SeedSequence.spawn), so the cohort is
+    reproducible and any chunk can be regenerated on its own.
+    """
+    n_chunks = max(1, -(-n_students // chunk_size))
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    for index, chunk_seed in enumerate(seeds):
+        first = index * chunk_size
+        size = min(chunk_size, n_students - first)
+        yield _student_chunk(np.random.default_rng(chunk_seed), size, first_id=first + 1)
+
+
+def create_student_dataset(n_students=150, seed=42):
+    """The whole cohort as one DataFrame (same columns as the handout version)."""
+    return next(iter_student_chunks(n_students, max(n_students, 1), seed))
+
+
+def write_student_csv(path, n_students, chunk_size=1_000_000, seed=42):
+    """Stream a cohort to CSV one chunk at a time."""
+    for index, chunk in enumerate(iter_student_chunks(n_students, chunk_size, seed)):
+        chunk.to_csv(path, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic student cohort.')
+    parser.add_argument('n_students', type=int)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default='students.csv')
+    args = parser.parse_args(argv)
+
+    write_student_csv(args.out, args.n_students, args.chunk_size, args.seed)
+    print(f'📚 Wrote {args.n_students:,} students to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
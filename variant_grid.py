@@ -0,0 +1,120 @@
+"""
+Style-comparison grids that build the plot geometry only once.
+
+PART 2 and PART 4 of histogram_scatter_explanation.py draw the same data six
+times, changing only color, alpha, marker size or edge color. Calling
+plt.hist() / plt.scatter() per panel re-bins the data and rebuilds every bar
+patch or marker collection from scratch.
+
+Here the geometry is computed once:
+- HistGeometry bins the values once (see histograms.BinCounter) and keeps
+  the bar outlines per bin setting, drawn as a single PolyCollection per panel
+- ScatterGeometry keeps the marker path and the (x, y) offsets
+
+and each panel only gets a cheap new artist with its own visual properties
+(set_sizes, set_alpha, set_facecolor, ...).
+
+    geometry = ScatterGeometry(x_vals, y_vals)
+    draw_variant_grid(geometry, [dict(title='Small points (s=20)', s=20, color='blue'),
+                                 dict(title='Transparent (alpha=0.3)', s=80, alpha=0.3)],
+                      nrows=1, ncols=2, xlabel='X values', ylabel='Y values')
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.collections import PathCollection, PolyCollection
+from matplotlib.markers import MarkerStyle
+from matplotlib.transforms import IdentityTransform
+
+from histograms import BinCounter
+
+
+class HistGeometry:
+    """Bar outlines of a histogram, computed once per bin setting."""
+
+    def __init__(self, values):
+        self.counter = BinCounter(values)
+        self._bars = {}
+
+    def bars(self, bins=10, range=None):
+        """(n_bins, 4, 2) rectangle corners for the given bins, like plt.hist's bars."""
+        key = (bins, range)
+        if key not in self._bars:
+            counts, edges = self.counter.counts(bins, range)
+            left, right = edges[:-1], edges[1:]
+            zeros = np.zeros_like(left)
+            self._bars[key] = np.stack([np.column_stack([left, zeros]),
+                                        np.column_stack([left, counts]),
+                                        np.column_stack([right, counts]),
+                                        np.column_stack([right, zeros])], axis=1)
+        return self._bars[key]
+
+    def draw(self, ax, bins=10, range=None, color=None, alpha=None, edgecolor=None, linewidth=None):
+        """Add the bars to `ax` with this panel's style. Returns the PolyCollection."""
+        bars = PolyCollection(self.bars(bins, range), closed=True)
+        bars.set_facecolor(color if color is not None else 'C0')
+        bars.set_edgecolor(edgecolor if edgecolor is not None else 'none')
+        bars.set_linewidth(linewidth if linewidth is not None else rcParams['patch.linewidth'])
+        bars.set_alpha(alpha)
+        bars.sticky_edges.y.append(0)  # bars start at zero, like plt.hist
+        ax.add_collection(bars)
+        ax.autoscale_view()
+        return bars
+
+
+class ScatterGeometry:
+    """Marker path and offsets of a scatter plot, shared by every panel."""
+
+    def __init__(self, x, y, marker='o'):
+        self.offsets = np.column_stack([x, y]).astype(float)
+        style = MarkerStyle(marker)
+        self.paths = [style.get_path().transformed(style.get_transform())]
+
+    def draw(self, ax, s=None, color=None, c=None, cmap=None, norm=None, alpha=None,
+             edgecolors='face', linewidths=None):
+        """Add the markers to `ax` with this panel's style. Returns the PathCollection."""
+        points = PathCollection(self.paths, offsets=self.offsets, offset_transform=ax.transData)
+        points.set_transform(IdentityTransform())
+        points.set_sizes(np.atleast_1d(s if s is not None else rcParams['lines.markersize'] ** 2))
+        if c is not None:
+            points.set_array(np.asarray(c))
+            points.set_cmap(cmap)
+            points.set_norm(norm)
+            points.autoscale_None()
+        else:
+            points.set_facecolor(color if color is not None else 'C0')
+        points.set_edgecolor(edgecolors)
+        if linewidths is not None:
+            points.set_linewidth(linewidths)
+        points.set_alpha(alpha)
+        ax.add_collection(points)
+        ax.autoscale_view()
+        return points
+
+
+def draw_variant_grid(geometry, variants, nrows, ncols, xlabel=None, ylabel=None, grid=False, start=1):
+    """One subplot per style variant, all drawn from the same geometry.
+
+    Each variant is a dict of style keywords for geometry.draw(), plus
+    'title' and optionally 'colorbar' (the colorbar label). Returns the artists.
+    """
+    artists = []
+    for position, variant in enumerate(variants, start):
+        style = dict(variant)
+        title = style.pop('title', None)
+        colorbar = style.pop('colorbar', None)
+        ax = plt.subplot(nrows, ncols, position)
+        artist = geometry.draw(ax, **style)
+        if colorbar is not None:
+            plt.colorbar(artist, label=colorbar)
+        if title is not None:
+            plt.title(title, fontweight='bold')
+        if xlabel is not None:
+            plt.xlabel(xlabel)
+        if ylabel is not None:
+            plt.ylabel(ylabel)
+        if grid:
+            plt.grid(True, alpha=0.3)
+        artists.append(artist)
+    return artists
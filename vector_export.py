@@ -0,0 +1,171 @@
+"""
+SVG/PDF export that stays small when a figure has huge scatter collections.
+
+The Chapter 2 lesson saves with plt.savefig('music_energy_analysis.png',
+dpi=300, bbox_inches='tight'). In SVG or PDF every marker of a scatter is
+written as its own vector path, so a 100k-song scatter turns into a file of
+hundreds of MB that takes minutes to write and to open.
+
+export_figure() saves the figure with the heavy artists (collections and
+lines with more than max_points points) rasterized, so they are embedded as
+one image, while axes, ticks, text and colorbars stay vectors. With a file
+size budget it keeps trying cheaper settings until the file fits:
+
+1. rasterize artists above max_points
+2. rasterize every collection and line that has more than a handful of points
+   (colorbar solids excepted)
+3. lower the resolution of the embedded images (dpi 300 -> 200 -> 150 -> 100 -> 72)
+
+Each attempt is rendered into memory; only the one that is kept is written.
+The figure's own rasterized settings are restored afterwards.
+
+    from vector_export import export_figure
+    report = export_figure(fig, 'music_energy_analysis.svg', max_bytes=2_000_000)
+
+Usage:
+    python vector_export.py part5_music_dashboard --songs 200000 --format svg --max-bytes 2MB
+"""
+
+import argparse
+import io
+import re
+import time
+from pathlib import Path
+
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import Collection
+from matplotlib.lines import Line2D
+
+from headless_render import SAVE_METADATA
+
+MAX_POINTS = 10_000
+VECTOR_FORMATS = {'svg', 'svgz', 'pdf', 'eps', 'ps'}
+FALLBACK_DPIS = [200, 150, 100, 72]
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+_SIZE = re.compile(r'(\d+(?:\.\d*)?|\.\d+)\s*([KMG]?)B?', flags=re.IGNORECASE)
+
+
+def parse_size(text):
+    """'2MB' / '2M' / '500kb' / '1048576' -> bytes (argparse.ArgumentTypeError otherwise)."""
+    match = _SIZE.fullmatch(str(text).strip())
+    if match is None:
+        raise argparse.ArgumentTypeError(f'invalid size {text!r} (e.g. 2MB, 500K or 1048576)')
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS[unit.upper()])
+
+
+def point_count(artist):
+    """How many markers/vertices an artist writes to a vector file."""
+    if isinstance(artist, Line2D):
+        return len(artist.get_xdata())
+    return max(len(artist.get_offsets()), len(artist.get_paths()))
+
+
+def colorbar_axes(fig):
+    """The axes of every colorbar drawn in fig."""
+    mappables = fig.findobj(lambda artist: isinstance(artist, ScalarMappable))
+    return {mappable.colorbar.ax for mappable in mappables if mappable.colorbar is not None}
+
+
+def heavy_artists(fig, max_points=MAX_POINTS):
+    """Collections and lines with more than max_points points (colorbars and text are never heavy)."""
+    skip = colorbar_axes(fig)  # their solids are a QuadMesh with one cell per color
+    artists = fig.findobj(lambda artist: isinstance(artist, (Collection, Line2D)))
+    artists = [artist for artist in artists if artist.axes not in skip]
+    return [artist for artist in artists if point_count(artist) > max_points]
+
+
+def _attempts(dpi, max_points):
+    yield dpi, max_points
+    if max_points > 100:
+        yield dpi, 100
+    for lower in FALLBACK_DPIS:
+        if lower < dpi:
+            yield lower, 100
+
+
+def export_figure(fig, path, fmt=None, max_points=MAX_POINTS, max_bytes=None, dpi=300,
+                  bbox_inches='tight', **kwargs):
+    """Save `fig` with heavy artists rasterized, within max_bytes if possible. Returns a report dict.
+
+    Raster formats (png, jpg, ...) are saved as usual. The report has the
+    final size, the write time, the dpi and threshold used and whether the
+    file is within the budget.
+    """
+    path = Path(path)
+    fmt = (fmt or path.suffix.lstrip('.') or 'png').lower()
+    kwargs.setdefault('metadata', SAVE_METADATA.get(fmt))
+    kwargs = dict(kwargs, format=fmt, bbox_inches=bbox_inches)
+
+    if fmt not in VECTOR_FORMATS:
+        start = time.perf_counter()
+        fig.savefig(path, dpi=dpi, **kwargs)
+        write_s = time.perf_counter() - start
+        size = path.stat().st_size
+        return {'path': str(path), 'format': fmt, 'bytes': size, 'write_s': write_s, 'dpi': dpi,
+                'max_points': None, 'rasterized': 0, 'attempts': 1,
+                'max_bytes': max_bytes, 'within_budget': max_bytes is None or size <= max_bytes}
+
+    original = {artist: artist.get_rasterized()
+                for artist in fig.findobj(lambda artist: isinstance(artist, (Collection, Line2D)))}
+    attempts = 0
+    try:
+        for attempt_dpi, threshold in _attempts(dpi, max_points):
+            heavy = heavy_artists(fig, threshold)
+            for artist in heavy:
+                artist.set_rasterized(True)
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            fig.savefig(buffer, dpi=attempt_dpi, **kwargs)
+            render_s = time.perf_counter() - start
+            attempts += 1
+            if max_bytes is None or buffer.tell() <= max_bytes:
+                break
+    finally:
+        for artist, rasterized in original.items():
+            artist.set_rasterized(rasterized)
+
+    start = time.perf_counter()
+    path.write_bytes(buffer.getvalue())
+    write_s = render_s + time.perf_counter() - start
+    size = buffer.tell()
+    return {'path': str(path), 'format': fmt, 'bytes': size, 'write_s': write_s, 'dpi': attempt_dpi,
+            'max_points': threshold, 'rasterized': len(heavy), 'attempts': attempts,
+            'max_bytes': max_bytes, 'within_budget': max_bytes is None or size <= max_bytes}
+
+
+def format_report(report):
+    budget = '' if report['max_bytes'] is None else \
+        f" (budget {report['max_bytes'] / 1024:,.0f} KB{'' if report['within_budget'] else ', EXCEEDED'})"
+    return (f"{Path(report['path']).name}: {report['bytes'] / 1024:,.1f} KB{budget} "
+            f"written in {report['write_s']:.2f}s, {report['rasterized']} artists rasterized "
+            f"at {report['dpi']} dpi, {report['attempts']} attempt(s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export lesson figures as compact SVG/PDF.')
+    parser.add_argument('names', nargs='+', help='lesson figures to export')
+    parser.add_argument('--out', default='figures')
+    parser.add_argument('--format', default='svg')
+    parser.add_argument('--songs', type=int, default=None, help='songs per figure (default: lesson size)')
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--max-points', type=int, default=MAX_POINTS,
+                        help='rasterize collections with more points than this')
+    parser.add_argument('--max-bytes', type=parse_size, default=None, help='file size budget, e.g. 2MB')
+    args = parser.parse_args(argv)
+
+    from headless_render import use_headless
+    plt = use_headless()
+    import lesson_figures
+    Path(args.out).mkdir(parents=True, exist_ok=True)
+    for name in args.names:
+        plt.rcParams['svg.hashsalt'] = name  # stable SVG element ids
+        fig = lesson_figures.build_figure(name, n=args.songs)
+        report = export_figure(fig, Path(args.out) / f'{name}.{args.format}', args.format,
+                               args.max_points, args.max_bytes, args.dpi)
+        plt.close(fig)
+        print(f"  {'📦' if report['within_budget'] else '⚠️ '} {format_report(report)}")
+
+
+if __name__ == '__main__':
+    main()